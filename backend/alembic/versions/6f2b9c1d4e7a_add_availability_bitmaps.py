@@ -0,0 +1,33 @@
+"""Add availability_bitmaps
+
+Revision ID: 6f2b9c1d4e7a
+Revises: 35cd4915f458
+Create Date: 2026-10-18 10:12:41.204518
+
+`busy` holds one bit per minute of the day (1440 bits, little-endian), set
+where an appointment or block touches that minute.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f2b9c1d4e7a'
+down_revision = '35cd4915f458'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('availability_bitmaps',
+    sa.Column('professional_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('busy', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['professional_id'], ['professionals.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('professional_id', 'date')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('availability_bitmaps')
@@ -0,0 +1,32 @@
+"""Exclude overlapping active appointments per professional
+
+Revision ID: b3d5e8f0a214
+Revises: 6f2b9c1d4e7a
+Create Date: 2026-10-18 11:04:19.530227
+
+Existing overlapping, non-cancelled appointments make the upgrade fail;
+cancel or reschedule them before running it.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3d5e8f0a214'
+down_revision = '6f2b9c1d4e7a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE appointments ADD CONSTRAINT appointments_no_overlap "
+        "EXCLUDE USING gist ("
+        "int4range(professional_id, professional_id, '[]') WITH &&, "
+        "tsrange(date_time, date_time + duration * interval '1 minute') WITH &&"
+        ") WHERE (status <> 'CANCELLED')"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE appointments DROP CONSTRAINT appointments_no_overlap")
@@ -0,0 +1,52 @@
+"""Composite indexes for the scheduling hot paths
+
+Revision ID: c7a1f4d92e58
+Revises: b3d5e8f0a214
+Create Date: 2026-10-18 11:47:02.118634
+
+Indexes are built with CREATE INDEX CONCURRENTLY, outside a transaction,
+so the upgrade can run against a live database without blocking writes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7a1f4d92e58'
+down_revision = 'b3d5e8f0a214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_appointments_professional_id_date_time_status', 'appointments',
+                        ['professional_id', 'date_time', 'status'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_appointments_client_id_date_time', 'appointments',
+                        ['client_id', 'date_time'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_blocks_professional_id_start_time_end_time', 'blocks',
+                        ['professional_id', 'start_time', 'end_time'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_working_hours_professional_id_day_of_week_active', 'working_hours',
+                        ['professional_id', 'day_of_week'],
+                        postgresql_where=sa.text('active'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_services_professional_id'), 'services',
+                        ['professional_id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_services_professional_id'), table_name='services',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_working_hours_professional_id_day_of_week_active', table_name='working_hours',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_blocks_professional_id_start_time_end_time', table_name='blocks',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_appointments_client_id_date_time', table_name='appointments',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_appointments_professional_id_date_time_status', table_name='appointments',
+                      postgresql_concurrently=True, if_exists=True)
@@ -1,18 +1,20 @@
 from typing import Generator, Optional
+from uuid import UUID
 import logging
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 
 from app.core import security
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.models.user import User
 from app.schemas.token import TokenPayload
-from app.crud.crud_user import user as crud_user
+from app.services import user_cache
 
 logger = logging.getLogger(__name__)
 
@@ -21,23 +23,49 @@ reusable_oauth2 = OAuth2PasswordBearer(
 )
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> User:
+def _decode_token(token: str) -> TokenPayload:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        token_data = TokenPayload(**payload)
+        return TokenPayload(**payload)
     except (JWTError, ValidationError):
         logger.warning("Failed to validate credentials")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
-    user = crud_user.get(db, id=token_data.sub)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+
+
+def _user_id(token: str) -> UUID:
+    token_data = _decode_token(token)
+    user_id = None
+    # Single-purpose tokens (claim_account) are not access tokens
+    if token_data.purpose is None:
+        try:
+            user_id = UUID(token_data.sub)
+        except (TypeError, ValueError):
+            pass
+    if user_id is None:
+        logger.warning("Failed to validate credentials")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+    return user_id
+
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> User:
+    user_id = _user_id(token)
+    user = user_cache.get(db, user_id)
+    if user is None:
+        generation = user_cache.generation()
+        user = db.get(User, user_id, options=[joinedload(User.professional)])
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        user_cache.store(user, generation)
     return user
 
 
@@ -47,3 +75,26 @@ def get_current_active_user(
     if not current_user.active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(reusable_oauth2)
+) -> User:
+    """Async variant of get_current_user."""
+    user_id = _user_id(token)
+    user = await user_cache.get_async(db, user_id)
+    if user is None:
+        generation = user_cache.generation()
+        user = await db.get(User, user_id, options=[joinedload(User.professional)])
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        user_cache.store(user, generation)
+    return user
+
+
+async def get_current_active_user_async(
+    current_user: User = Depends(get_current_user_async),
+) -> User:
+    if not current_user.active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
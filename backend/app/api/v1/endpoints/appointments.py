@@ -1,9 +1,11 @@
 
-from typing import Any, List
+from typing import Any, List, Optional
 from datetime import datetime
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
 from app.api import deps
@@ -11,9 +13,11 @@ from app.models.appointment import Appointment
 from app.models.user import User
 from app.models.service import Service
 from app.models.professional import Professional
-from app.models.working_hours import WorkingHours
-from app.models.block import Block
 from app.schemas.appointment import Appointment as AppointmentSchema, AppointmentCreate, AppointmentUpdate
+from app.services import availability_bitmap, availability_cache
+from app.services.availability import day_slots, upcoming_slots
+from app.services.availability_loader import date_range, load_busy_by_day, load_working_hours
+from app.services.booking import flush_appointment, link_loaded, load_professional_and_service
 from app.services.notifications import send_appointment_confirmation
 
 router = APIRouter()
@@ -28,17 +32,16 @@ def create_appointment(
 ) -> Any:
     """
     Create new appointment.
+
+    One query loads the professional (with their user) and the service; the
+    appointment comes back from INSERT ... RETURNING, and the client is the
+    current user, so serializing the response needs no further queries.
     """
     # Check if slot is available (simplified for now, full validation in available-slots)
-    # Check if professional exists
-    professional = db.query(Professional).filter(Professional.id == appointment_in.professional_id).first()
-    if not professional:
-        raise HTTPException(status_code=404, detail="Professional not found")
-
-    # Check if service exists
-    service = db.query(Service).filter(Service.id == appointment_in.service_id).first()
-    if not service:
-        raise HTTPException(status_code=404, detail="Service not found")
+    # Check if professional and service exist
+    professional, service = load_professional_and_service(
+        db, appointment_in.professional_id, appointment_in.service_id
+    )
 
     appointment = Appointment(
         professional_id=appointment_in.professional_id,
@@ -49,8 +52,11 @@ def create_appointment(
         notes=appointment_in.notes
     )
     db.add(appointment)
+    flush_appointment(db)
+    link_loaded(appointment, professional, service, current_user)
+    availability_bitmap.refresh_days(db, appointment.professional_id, [appointment.date_time.date()])
     db.commit()
-    db.refresh(appointment)
+    availability_cache.invalidate(appointment.professional_id, [appointment.date_time.date()])
 
     # Queue confirmation email to be sent in the background using FastAPI's queue
     background_tasks.add_task(
@@ -63,136 +69,219 @@ def create_appointment(
         duration=service.duration,
     )
 
-    # Re-query with joined models to avoid lazy-loading issues during serialization
-    appointment = db.query(Appointment).options(
-        joinedload(Appointment.professional).joinedload(Professional.user),
-        joinedload(Appointment.client),
-        joinedload(Appointment.service)
-    ).filter(Appointment.id == appointment.id).first()
-
     return appointment
 
-from sqlalchemy.orm import joinedload
-
 @router.get("/my-appointments", response_model=List[AppointmentSchema])
-def read_my_appointments(
-    db: Session = Depends(deps.get_db),
+async def read_my_appointments(
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: User = Depends(deps.get_current_active_user_async),
 ) -> Any:
     """
     Retrieve appointments for the current user (as client or professional).
     """
     # Eager load relationships needed for response properties
-    query = db.query(Appointment).options(
+    query = select(Appointment).options(
         joinedload(Appointment.professional).joinedload(Professional.user),
         joinedload(Appointment.service),
         joinedload(Appointment.client)
     )
 
     if current_user.type == "professional" and current_user.professional:
-        appointments = query.filter(
-            Appointment.professional_id == current_user.professional.id
-        ).offset(skip).limit(limit).all()
+        query = query.filter(Appointment.professional_id == current_user.professional.id)
     else:
-        appointments = query.filter(
-            Appointment.client_id == current_user.id
-        ).offset(skip).limit(limit).all()
-        
-    return appointments
+        query = query.filter(Appointment.client_id == current_user.id)
+
+    result = await db.execute(query.offset(skip).limit(limit))
+    return result.scalars().all()
 
 from datetime import timedelta, date as date_cls, time as time_cls, datetime
 
+MAX_RANGE_DAYS = 31
+
+
+def _parse_date(value: str) -> date_cls:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+
+def _compute_day_slots(db: Session, professional_id: int, query_date: date_cls, service_id: int) -> List[str]:
+    # 1. Get working hours
+    working_hours = load_working_hours(db, [professional_id])
+    hours = working_hours.get((professional_id, query_date.weekday()))  # 0=Monday, 6=Sunday
+    if not hours:
+        return []
+
+    # 2. Get service duration
+    service = db.get(Service, service_id)
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+
+    duration = service.duration # in minutes
+
+    # 3. Sweep the day's busy intervals, read from its stored bitmap when there is one
+    busy = availability_bitmap.load_day_busy(db, professional_id, query_date)
+    return day_slots(query_date, hours[0], hours[1], duration, busy)
+
+
 @router.get("/available-slots")
-def get_available_slots(
+async def get_available_slots(
     professional_id: int,
     date: str, # YYYY-MM-DD
     service_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
 ) -> Any:
     """
     Get available slots for a professional on a specific date.
+    Slots that have already started are left out.
     """
-    try:
-        query_date = datetime.strptime(date, "%Y-%m-%d").date()
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    query_date = _parse_date(date)
 
-    weekday = query_date.weekday() # 0=Monday, 6=Sunday
+    # The cache holds the whole day; the clock is applied on the way out
+    cached = availability_cache.get_slots(professional_id, query_date, service_id)
+    if cached is not None:
+        return {"date": date, "slots": upcoming_slots(query_date, cached, datetime.now())}
+    generation = availability_cache.generation()
 
-    # 1. Get working hours
-    working_hours = db.query(WorkingHours).filter(
-        WorkingHours.professional_id == professional_id,
-        WorkingHours.day_of_week == weekday,
-        WorkingHours.active == True
-    ).first()
+    # The loaders and bitmap helpers are shared with the sync write paths
+    slots = await db.run_sync(_compute_day_slots, professional_id, query_date, service_id)
+    availability_cache.store_slots(professional_id, query_date, service_id, slots, generation)
+    return {"date": date, "slots": upcoming_slots(query_date, slots, datetime.now())}
 
-    if not working_hours:
-        return {"date": date, "slots": []}
 
-    # 2. Get service duration
+@router.get("/available-slots/range")
+def get_available_slots_range(
+    professional_id: int,
+    start_date: str, # YYYY-MM-DD
+    end_date: str, # YYYY-MM-DD
+    service_id: int,
+    db: Session = Depends(deps.get_db),
+) -> Any:
+    """
+    Get available slots for a professional for every date in a range.
+    Loads the whole window with one query per table.
+    """
+    first_day = _parse_date(start_date)
+    last_day = _parse_date(end_date)
+    if last_day < first_day:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if (last_day - first_day).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_RANGE_DAYS} days")
+
     service = db.query(Service).filter(Service.id == service_id).first()
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
-    
-    duration = service.duration # in minutes
 
-    # 3. Get existing appointments
-    appointments = db.query(Appointment).filter(
-        Appointment.professional_id == professional_id,
-        Appointment.date_time >= datetime.combine(query_date, time_cls.min),
-        Appointment.date_time <= datetime.combine(query_date, time_cls.max),
-        Appointment.status != "cancelled" # Assuming there's a cancelled status or similar logic
-    ).all()
-
-    # 4. Get blocks
-    # Blocks can span multiple days, so we check for overlap
-    # Block start < day_end AND Block end > day_start
-    day_start = datetime.combine(query_date, time_cls.min)
-    day_end = datetime.combine(query_date, time_cls.max)
-    
-    blocks = db.query(Block).filter(
-        Block.professional_id == professional_id,
-        Block.start_time < day_end,
-        Block.end_time > day_start
-    ).all()
-
-    # 5. Generate slots
-    slots = []
-    current_time = datetime.combine(query_date, working_hours.start_time)
-    end_time = datetime.combine(query_date, working_hours.end_time)
-
-    while current_time + timedelta(minutes=duration) <= end_time:
-        slot_start = current_time
-        slot_end = current_time + timedelta(minutes=duration)
-        
-        is_available = True
-        
-        # Check appointments
-        for appt in appointments:
-            appt_start = appt.date_time
-            appt_end = appt.date_time + timedelta(minutes=appt.duration)
-            
-            # Check overlap: (StartA < EndB) and (EndA > StartB)
-            if slot_start < appt_end and slot_end > appt_start:
-                is_available = False
-                break
-        
-        # Check blocks
-        if is_available:
-            for block in blocks:
-                # Check overlap
-                if slot_start < block.end_time and slot_end > block.start_time:
-                    is_available = False
-                    break
-        
-        if is_available:
-            slots.append(slot_start.strftime("%H:%M"))
-            
-        current_time += timedelta(minutes=duration)
+    working_hours = load_working_hours(db, [professional_id])
+    busy = load_busy_by_day(db, [professional_id], first_day, last_day)
+    now = datetime.now()
+
+    days = []
+    for day in date_range(first_day, last_day):
+        hours = working_hours.get((professional_id, day.weekday()))
+        slots = upcoming_slots(day, day_slots(
+            day, hours[0], hours[1], service.duration,
+            busy.get((professional_id, day), []),
+        ), now) if hours else []
+        days.append({"date": day.isoformat(), "slots": slots})
+
+    return {
+        "professional_id": professional_id,
+        "service_id": service_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "days": days,
+    }
+
+
+@router.get("/first-available")
+def search_first_available(
+    start_date: str, # YYYY-MM-DD
+    end_date: str, # YYYY-MM-DD
+    especialidade: Optional[str] = None,
+    service_name: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(deps.get_db),
+) -> Any:
+    """
+    Find the earliest free slots across every professional matching a
+    speciality and/or service name, computed in one batched pass.
+    Each matching service is searched with its own duration, and slots
+    that have already started are left out.
+    """
+    if not especialidade and not service_name:
+        raise HTTPException(status_code=400, detail="Provide especialidade or service_name")
+
+    first_day = _parse_date(start_date)
+    last_day = _parse_date(end_date)
+    if last_day < first_day:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if (last_day - first_day).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_RANGE_DAYS} days")
+
+    # 1. Matching (professional, service) pairs
+    query = db.query(
+        Professional.id.label("professional_id"),
+        Professional.speciality,
+        User.name.label("professional_name"),
+        Service.id.label("service_id"),
+        Service.name.label("service_name"),
+        Service.duration,
+    ).join(User, Professional.user_id == User.id).join(
+        Service, Service.professional_id == Professional.id
+    ).filter(User.active == True, Service.active == True)
+
+    if especialidade:
+        search_term = f"%{especialidade}%"
+        query = query.filter(
+            or_(
+                Professional.speciality.ilike(search_term),
+                User.name.ilike(search_term)
+            )
+        )
+    if service_name:
+        query = query.filter(Service.name.ilike(f"%{service_name}%"))
+
+    candidates = query.order_by(Professional.id, Service.id).all()
+    if not candidates:
+        return {"results": []}
+
+    # 2. Working hours, appointments and blocks of all of them at once
+    professional_ids = list({candidate.professional_id for candidate in candidates})
+    working_hours = load_working_hours(db, professional_ids)
+    busy = load_busy_by_day(db, professional_ids, first_day, last_day)
+    now = datetime.now()
+
+    # 3. Sweep day by day; later days can only hold later slots
+    results = []
+    for day in date_range(first_day, last_day):
+        for candidate in candidates:
+            professional_id = candidate.professional_id
+            hours = working_hours.get((professional_id, day.weekday()))
+            if not hours:
+                continue
+            for slot in upcoming_slots(day, day_slots(
+                day, hours[0], hours[1], candidate.duration,
+                busy.get((professional_id, day), []),
+            ), now):
+                results.append({
+                    "date": day.isoformat(),
+                    "slot": slot,
+                    "professional_id": professional_id,
+                    "professional_name": candidate.professional_name,
+                    "speciality": candidate.speciality,
+                    "service_id": candidate.service_id,
+                    "service_name": candidate.service_name,
+                    "duration": candidate.duration,
+                })
+        if len(results) >= limit:
+            break
 
-    return {"date": date, "slots": slots}
+    results.sort(key=lambda r: (r["date"], r["slot"], r["professional_id"], r["service_id"]))
+    return {"results": results[:limit]}
 
 
 @router.put("/{id}", response_model=AppointmentSchema)
@@ -220,13 +309,17 @@ def update_appointment(
     else:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
+    previous_date = appointment.date_time.date()
     update_data = appointment_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(appointment, field, value)
 
+    affected_days = {previous_date, appointment.date_time.date()}
     db.add(appointment)
+    flush_appointment(db)
+    availability_bitmap.refresh_days(db, appointment.professional_id, affected_days)
     db.commit()
-    db.refresh(appointment)
+    availability_cache.invalidate(appointment.professional_id, affected_days)
     return appointment
 
 @router.delete("/{id}")
@@ -251,6 +344,8 @@ def delete_appointment(
     from app.core.enums.appointment_status import AppointmentStatus
     appointment.status = AppointmentStatus.CANCELLED
     db.add(appointment)
+    db.flush()
+    availability_bitmap.refresh_days(db, appointment.professional_id, [appointment.date_time.date()])
     db.commit()
-    db.refresh(appointment)
+    availability_cache.invalidate(appointment.professional_id, [appointment.date_time.date()])
     return {"message": "Agendamento cancelado com sucesso"}
@@ -1,30 +1,45 @@
 from datetime import timedelta
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
 from app.core import security
 from app.core.config import settings
 from app.crud.crud_user import user as crud_user
+from app.models.user import User
 from app.schemas.token import Token
+from app.schemas.user import ClaimAccount, ClaimAccountRequest
 from app.core.logging.log_service import LogService
 from app.core.logging.log_dependency import get_log_service
 from app.core.logging.log_schema import ActorContext
+from app.services import user_cache
+from app.services.notifications import claim_account_url, send_claim_account_email
 
 router = APIRouter()
 
 
+def _token_response(user: User) -> dict:
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return {
+        "access_token": security.create_access_token(
+            user.id, expires_delta=access_token_expires
+        ),
+        "token_type": "bearer",
+    }
+
+
 @router.post("/access-token", response_model=Token)
 async def login_access_token(
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends(),
     log_service: LogService = Depends(get_log_service),
 ) -> Any:
     """OAuth2 compatible token login, get an access token for future requests."""
-    user = crud_user.authenticate(db, email=form_data.username, password=form_data.password)
+    user = await crud_user.authenticate_async(db, email=form_data.username, password=form_data.password)
 
     if not user:
         await log_service.audit(
@@ -44,8 +59,6 @@ async def login_access_token(
         )
         raise HTTPException(status_code=400, detail="Inactive user")
 
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-
     await log_service.audit(
         action="LOGIN_SUCCESS",
         message=f"User logged in successfully",
@@ -53,9 +66,66 @@ async def login_access_token(
         actor=ActorContext(user_id=str(user.id), email=user.email, role=str(user.type)),
     )
 
-    return {
-        "access_token": security.create_access_token(
-            user.id, expires_delta=access_token_expires
-        ),
-        "token_type": "bearer",
-    }
+    return _token_response(user)
+
+
+@router.post("/claim-account/request", status_code=202)
+async def request_claim_account(
+    claim_in: ClaimAccountRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(deps.get_async_db),
+) -> Any:
+    """
+    Email a guest account a link to set its first password.
+
+    The answer is the same whether or not the email belongs to a guest account.
+    """
+    user = await crud_user.get_by_email_async(db, email=claim_in.email)
+    if user and user.active and not security.has_usable_password(user.password):
+        token = security.create_claim_account_token(user.id, user.password)
+        background_tasks.add_task(
+            send_claim_account_email,
+            client_name=user.name,
+            client_email=user.email,
+            claim_url=claim_account_url(token),
+        )
+    return {"message": "Se o e-mail pertencer a uma conta sem senha, enviaremos um link para criá-la"}
+
+
+@router.post("/claim-account", response_model=Token)
+async def claim_account(
+    claim_in: ClaimAccount,
+    db: AsyncSession = Depends(deps.get_async_db),
+    log_service: LogService = Depends(get_log_service),
+) -> Any:
+    """Set the first password of a guest account from an emailed token, and log in."""
+    claim = security.decode_claim_account_token(claim_in.token)
+    user = await db.get(User, claim[0]) if claim else None
+    if not user or not user.active or not security.claim_account_token_matches(claim[1], user.password):
+        raise HTTPException(status_code=400, detail="Invalid or expired token")
+
+    hashed_password = await security.get_password_hash_async(claim_in.password)
+    # Only replaces the password the token was issued for, so a token
+    # cannot be used twice even by concurrent requests
+    claimed = await db.execute(
+        update(User)
+        .where(User.id == user.id, User.password == user.password)
+        .values(password=hashed_password)
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    )
+    if claimed.scalar_one_or_none() is None:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Invalid or expired token")
+    await db.commit()
+    user_cache.invalidate(user.id)
+
+    await log_service.audit(
+        action="ACCOUNT_CLAIMED",
+        message="Guest account claimed",
+        category="auth",
+        actor=ActorContext(user_id=str(user.id), email=user.email, role=str(user.type)),
+    )
+
+    return _token_response(user)
+
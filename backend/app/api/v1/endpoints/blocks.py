@@ -5,6 +5,7 @@ from app.api import deps
 from app.models.block import Block as BlockModel
 from app.models.user import User
 from app.schemas.block import Block, BlockCreate, BlockUpdate
+from app.services import availability_bitmap, availability_cache
 
 router = APIRouter()
 
@@ -39,8 +40,12 @@ def create_block(
         
     block = BlockModel(**block_in.model_dump())
     db.add(block)
+    db.flush()
+    availability_bitmap.refresh_days(
+        db, block.professional_id, availability_bitmap.days_spanned(block.start_time, block.end_time)
+    )
     db.commit()
-    db.refresh(block)
+    availability_cache.invalidate_span(block.professional_id, block.start_time, block.end_time)
     return block
 
 @router.delete("/{id}", response_model=Block)
@@ -61,5 +66,10 @@ def delete_block(
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
     db.delete(block)
+    db.flush()
+    availability_bitmap.refresh_days(
+        db, block.professional_id, availability_bitmap.days_spanned(block.start_time, block.end_time)
+    )
     db.commit()
+    availability_cache.invalidate_span(block.professional_id, block.start_time, block.end_time)
     return block
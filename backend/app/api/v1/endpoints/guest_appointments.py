@@ -1,18 +1,17 @@
 from typing import Any
 from datetime import datetime
-import secrets
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, BackgroundTasks
+from sqlalchemy.orm import Session
 
 from app.api import deps
-from app.core.security import get_password_hash
+from app.core.security import create_claim_account_token, has_usable_password
+from app.crud.crud_user import user as crud_user
 from app.models.appointment import Appointment
-from app.models.user import User, UserType
-from app.models.service import Service
-from app.models.professional import Professional
 from app.schemas.appointment import Appointment as AppointmentSchema, GuestAppointmentCreate
-from app.services.notifications import send_appointment_confirmation
+from app.services import availability_bitmap, availability_cache
+from app.services.booking import flush_appointment, link_loaded, load_professional_and_service
+from app.services.notifications import claim_account_url, send_appointment_confirmation
 
 router = APIRouter()
 
@@ -26,33 +25,25 @@ def create_guest_appointment(
     """
     Create new appointment for an unauthenticated guest user.
     Silently creates a user and client profile if the email doesn't exist.
+
+    Everything is written in one transaction: one query for the professional
+    and service, one upsert for the user, the appointment insert and the
+    availability bitmap refresh. Nothing is reloaded after the commit.
     """
     # 1. Check if professional and service exist
-    professional = db.query(Professional).filter(Professional.id == appointment_in.professional_id).first()
-    if not professional:
-        raise HTTPException(status_code=404, detail="Professional not found")
-
-    service = db.query(Service).filter(Service.id == appointment_in.service_id).first()
-    if not service:
-        raise HTTPException(status_code=404, detail="Service not found")
+    professional, service = load_professional_and_service(
+        db, appointment_in.professional_id, appointment_in.service_id
+    )
 
-    # 2. Find or create the User based on email
-    user = db.query(User).filter(User.email == appointment_in.client_email).first()
-    
-    if not user:
-        # Generate a random secure password for the guest account since they won't log in immediately
-        random_password = secrets.token_urlsafe(32)
-        
-        user = User(
-            email=appointment_in.client_email,
-            name=appointment_in.client_name,
-            phone=appointment_in.client_phone,
-            password=get_password_hash(random_password),
-            type=UserType.CLIENT,
-            active=True,
-        )
-        db.add(user)
-        db.flush() # Get user ID before committing
+    # 2. Find or create the User based on email. Guests get no password
+    # until they claim the account; hashing a random one would only spend
+    # bcrypt CPU on a public endpoint
+    user = crud_user.get_or_create_guest(
+        db,
+        email=appointment_in.client_email,
+        name=appointment_in.client_name,
+        phone=appointment_in.client_phone,
+    )
 
     # 3. Create the appointment
     appointment = Appointment(
@@ -64,10 +55,16 @@ def create_guest_appointment(
         notes=appointment_in.notes
     )
     db.add(appointment)
+    flush_appointment(db)
+    link_loaded(appointment, professional, service, user)
+    availability_bitmap.refresh_days(db, appointment.professional_id, [appointment.date_time.date()])
     db.commit()
-    db.refresh(appointment)
+    availability_cache.invalidate(appointment.professional_id, [appointment.date_time.date()])
 
-    # 4. Queue confirmation email
+    # 4. Queue confirmation email, with a link to set a password for guests without one
+    claim_url = None
+    if not has_usable_password(user.password):
+        claim_url = claim_account_url(create_claim_account_token(user.id, user.password))
     background_tasks.add_task(
         send_appointment_confirmation,
         client_name=user.name,
@@ -76,13 +73,7 @@ def create_guest_appointment(
         service_name=service.name,
         professional_name=professional.user.name if professional.user else "Profissional",
         duration=service.duration,
+        claim_url=claim_url,
     )
 
-    # 5. Re-query with joined models to avoid lazy-loading issues during serialization
-    appointment = db.query(Appointment).options(
-        joinedload(Appointment.professional).joinedload(Professional.user),
-        joinedload(Appointment.client),
-        joinedload(Appointment.service)
-    ).filter(Appointment.id == appointment.id).first()
-
     return appointment
@@ -1,8 +1,24 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import AsyncIterator, Optional
 
-from app.core.logging.log_dependency import get_log_service
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pymongo.errors import PyMongoError
+
+from app.core.logging.log_dependency import get_log_service, require_log_query_key
+from app.core.logging.log_query import (
+    InvalidCursor,
+    LogQuery,
+    audit_trail_query,
+    errors_query,
+    stream_page,
+    trace_query,
+)
+from app.core.logging.log_repository import get_log_collection
 from app.core.logging.log_schema import FrontendLogPayload
+from app.core.logging.log_settings import log_settings
 from app.core.logging.log_service import LogService
+from app.core.logging.log_writer import log_writer
 
 router = APIRouter()
 
@@ -22,3 +38,63 @@ async def receive_frontend_log(
         trace_id=payload.trace_id,
     )
     return {"status": "accepted"}
+
+
+@router.get("/stats", dependencies=[Depends(require_log_query_key)])
+def get_log_pipeline_stats() -> dict:
+    """Queue depth and queued/written/dropped/failed counters of this worker's log writer."""
+    return log_writer.stats()
+
+
+PageSize = Query(100, ge=1, le=log_settings.LOG_QUERY_MAX_PAGE_SIZE)
+
+
+async def _page_response(query: LogQuery, cursor: Optional[str], limit: int) -> StreamingResponse:
+    body = stream_page(get_log_collection(), query, cursor, limit)
+    # Run up to the first chunk here, so a bad cursor or an unreachable
+    # Mongo still gets a proper status code instead of a broken stream
+    try:
+        first = await anext(body)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    except PyMongoError:
+        raise HTTPException(status_code=503, detail="Log storage unavailable")
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield first
+        async for chunk in body:
+            yield chunk
+
+    return StreamingResponse(chunks(), media_type="application/json")
+
+
+@router.get("/traces/{trace_id}", dependencies=[Depends(require_log_query_key)])
+async def read_trace(
+    trace_id: str, cursor: Optional[str] = None, limit: int = PageSize
+) -> StreamingResponse:
+    """Everything logged under one trace_id, oldest first."""
+    return await _page_response(trace_query(trace_id), cursor, limit)
+
+
+@router.get("/errors", dependencies=[Depends(require_log_query_key)])
+async def read_errors(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    category: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = PageSize,
+) -> StreamingResponse:
+    """Error logs in [start, end), newest first, optionally for one category."""
+    return await _page_response(errors_query(start, end, category), cursor, limit)
+
+
+@router.get("/users/{user_id}/audit", dependencies=[Depends(require_log_query_key)])
+async def read_audit_trail(
+    user_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = PageSize,
+) -> StreamingResponse:
+    """A user's audit trail in [start, end), newest first."""
+    return await _page_response(audit_trail_query(user_id, start, end), cursor, limit)
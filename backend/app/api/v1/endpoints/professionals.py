@@ -1,26 +1,29 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import Select, or_, select
 from app.api import deps
 from app.models.professional import Professional as ProfessionalModel
-from app.schemas.professional import Professional, ProfessionalUpdate
+from app.schemas.professional import Professional, ProfessionalSummary, ProfessionalUpdate
 from app.models.user import User
+from app.services import user_cache
 
 router = APIRouter()
 
-@router.get("/", response_model=List[Professional])
-def read_professionals(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
-    especialidade: Optional[str] = None,
-) -> Any:
-    """
-    Retrieve professionals.
-    """
-    query = db.query(ProfessionalModel).join(User).filter(User.active == True)
-    
+
+def _link_user_profile(professionals: List[ProfessionalModel]) -> None:
+    # The response nests user.professional; point it back at the loaded row
+    # instead of letting serialization lazy-load it outside the event loop.
+    for professional in professionals:
+        if professional.user is not None:
+            set_committed_value(professional.user, "professional", professional)
+
+
+def _filter_active(query: Select, especialidade: Optional[str]) -> Select:
+    """Active professionals, optionally matching a speciality or name, in a stable page order."""
+    query = query.join(ProfessionalModel.user).filter(User.active == True)
     if especialidade:
         search_term = f"%{especialidade}%"
         query = query.filter(
@@ -29,21 +32,77 @@ def read_professionals(
                 User.name.ilike(search_term)
             )
         )
-        
-    professionals = query.offset(skip).limit(limit).all()
+    return query.order_by(ProfessionalModel.id)
+
+
+@router.get("/", response_model=List[Professional])
+async def read_professionals(
+    db: AsyncSession = Depends(deps.get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    especialidade: Optional[str] = None,
+) -> Any:
+    """
+    Retrieve professionals.
+
+    A fixed number of statements per page, not one per row: professionals
+    joined with their users, then the page's services in IN batches of 500.
+    """
+    query = _filter_active(
+        select(ProfessionalModel).options(
+            contains_eager(ProfessionalModel.user), selectinload(ProfessionalModel.services)
+        ),
+        especialidade,
+    )
+    result = await db.execute(query.offset(skip).limit(limit))
+    professionals = result.scalars().all()
+    _link_user_profile(professionals)
     return professionals
 
+
+@router.get("/directory", response_model=List[ProfessionalSummary])
+async def read_professionals_directory(
+    db: AsyncSession = Depends(deps.get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    especialidade: Optional[str] = None,
+) -> Any:
+    """
+    Lean listing for directory views: the columns a card needs, no services.
+
+    One statement returning plain rows, with no ORM objects to build.
+    """
+    query = _filter_active(
+        select(
+            ProfessionalModel.id,
+            ProfessionalModel.user_id,
+            User.name,
+            ProfessionalModel.speciality,
+            ProfessionalModel.photo_url,
+            ProfessionalModel.address,
+        ).select_from(ProfessionalModel),
+        especialidade,
+    )
+    result = await db.execute(query.offset(skip).limit(limit))
+    return result.all()
+
+
 @router.get("/{professional_id}", response_model=Professional)
-def read_professional(
+async def read_professional(
     professional_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
 ) -> Any:
     """
     Get professional by ID.
     """
-    professional = db.query(ProfessionalModel).filter(ProfessionalModel.id == professional_id).first()
+    professional = await db.get(
+        ProfessionalModel,
+        professional_id,
+        options=[selectinload(ProfessionalModel.user), selectinload(ProfessionalModel.services)],
+    )
     if not professional:
         raise HTTPException(status_code=404, detail="Professional not found")
+    _link_user_profile([professional])
     return professional
 
 @router.put("/{professional_id}", response_model=Professional)
@@ -70,5 +129,5 @@ def update_professional(
 
     db.add(professional)
     db.commit()
-    db.refresh(professional)
+    user_cache.invalidate(professional.user_id)
     return professional
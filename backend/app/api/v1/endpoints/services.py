@@ -1,16 +1,19 @@
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.models.service import Service as ServiceModel
 from app.models.user import User
 from app.schemas.service import Service, ServiceCreate, ServiceUpdate
+from app.services import availability_cache
 
 router = APIRouter()
 
 @router.get("/", response_model=List[Service])
-def read_services(
-    db: Session = Depends(deps.get_db),
+async def read_services(
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 100,
     professional_id: int = None
@@ -18,11 +21,11 @@ def read_services(
     """
     Retrieve services.
     """
-    query = db.query(ServiceModel)
+    query = select(ServiceModel)
     if professional_id:
         query = query.filter(ServiceModel.professional_id == professional_id)
-    services = query.offset(skip).limit(limit).all()
-    return services
+    result = await db.execute(query.offset(skip).limit(limit))
+    return result.scalars().all()
 
 @router.post("/", response_model=Service)
 def create_service(
@@ -47,7 +50,6 @@ def create_service(
     service = ServiceModel(**service_in.model_dump())
     db.add(service)
     db.commit()
-    db.refresh(service)
     return service
 
 @router.put("/{id}", response_model=Service)
@@ -74,7 +76,8 @@ def update_service(
 
     db.add(service)
     db.commit()
-    db.refresh(service)
+    # Cached slots depend on the service's duration and active flag
+    availability_cache.invalidate(service.professional_id)
     return service
 
 @router.delete("/{id}", response_model=Service)
@@ -96,4 +99,5 @@ def delete_service(
 
     db.delete(service)
     db.commit()
+    availability_cache.invalidate(service.professional_id)
     return service
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Body, Depends, HTTPException
 from fastapi.encoders import jsonable_encoder
 from pydantic.networks import EmailStr
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.core.database import get_db
 from app.crud.crud_user import user as crud_user
@@ -62,12 +63,14 @@ def create_user(
     user = crud_user.create(db, obj_in=user_in)
     
     # Automatically create Professional record if user type is PROFESSIONAL
+    professional = None
     if user.type == "professional" or user.type == UserType.PROFESSIONAL:
         from app.models.professional import Professional
         professional = Professional(user_id=user.id)
         db.add(professional)
         db.commit()
-        db.refresh(professional)
+    # The response nests the profile; a new user has no other one to load
+    set_committed_value(user, "professional", professional)
         
     return user
 
@@ -5,6 +5,7 @@ from app.api import deps
 from app.models.working_hours import WorkingHours as WorkingHoursModel
 from app.models.user import User
 from app.schemas.working_hours import WorkingHours, WorkingHoursCreate, WorkingHoursUpdate
+from app.services import availability_cache
 
 router = APIRouter()
 
@@ -46,16 +47,9 @@ def update_working_hours_batch(
     # Delete existing
     db.query(WorkingHoursModel).filter(WorkingHoursModel.professional_id == professional_id).delete()
     
-    new_hours = []
-    for wh in working_hours_in:
-        db_obj = WorkingHoursModel(**wh.model_dump())
-        db.add(db_obj)
-        new_hours.append(db_obj)
-    
+    # Flushed as one multi-row INSERT ... RETURNING id
+    new_hours = [WorkingHoursModel(**wh.model_dump()) for wh in working_hours_in]
+    db.add_all(new_hours)
     db.commit()
-    
-    # Refresh to get IDs
-    for nh in new_hours:
-        db.refresh(nh)
-        
+    availability_cache.invalidate(professional_id)
     return new_hours
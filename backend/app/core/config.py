@@ -17,6 +17,10 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 120
+    # Link emailed to guests to set their first password
+    CLAIM_ACCOUNT_TOKEN_EXPIRE_MINUTES: int = 60 * 24
+    # Threads that run bcrypt for async endpoints (per worker process)
+    PASSWORD_HASH_WORKERS: int = 2
 
     # CORS — configure via env var for production (JSON array)
     BACKEND_CORS_ORIGINS: list[str] = [
@@ -30,6 +34,8 @@ class Settings(BaseSettings):
     EMAILS_FROM_ADDRESS: str = "contato@fgsoftware.digital"
     EMAILS_FROM_NAME: str = "Astrocode"
     EMAILS_ENABLED: bool = False
+    # Base of the links sent in emails
+    FRONTEND_URL: str = "http://localhost:4200"
 
     # Cloudinary
     CLOUDINARY_CLOUD_NAME: str = ""
@@ -37,6 +43,20 @@ class Settings(BaseSettings):
     CLOUDINARY_API_SECRET: str = ""
 
     DATABASE_URL: Optional[str] = None
+    # Derived from DATABASE_URL (asyncpg driver) unless set explicitly
+    ASYNC_DATABASE_URL: Optional[str] = None
+    ASYNC_DB_POOL_SIZE: int = 10
+    ASYNC_DB_MAX_OVERFLOW: int = 20
+
+    # Availability cache (per worker process)
+    AVAILABILITY_CACHE_MAX_SIZE: int = 4096
+    AVAILABILITY_CACHE_TTL_SECONDS: int = 30
+    # Busy bitmaps are stored for today through this many days ahead
+    AVAILABILITY_BITMAP_HORIZON_DAYS: int = 90
+
+    # Authenticated-user cache (per worker process)
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 30
 
     model_config = SettingsConfigDict(
         env_file=(".env", "../.env"),
@@ -46,10 +66,13 @@ class Settings(BaseSettings):
 
     @model_validator(mode='after')
     def assemble_db_connection(self) -> 'Settings':
-        if isinstance(self.DATABASE_URL, str):
-            return self
-        
-        self.DATABASE_URL = f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        if not isinstance(self.DATABASE_URL, str):
+            self.DATABASE_URL = f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
+        if not isinstance(self.ASYNC_DATABASE_URL, str):
+            # Same database through asyncpg; it spells libpq's sslmode as ssl
+            _, _, rest = self.DATABASE_URL.partition("://")
+            self.ASYNC_DATABASE_URL = "postgresql+asyncpg://" + rest.replace("sslmode=", "ssl=")
         return self
 
 settings = Settings()
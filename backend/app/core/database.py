@@ -1,9 +1,34 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.query_stats import instrument_engine
 
 engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects keep their state after commit, so write endpoints return what
+# they just wrote without reloading it. Column defaults are all computed in
+# Python and the primary key comes back from INSERT ... RETURNING, so a
+# flushed object already holds every column. This applies to every sync
+# session: after commit, objects keep the values they had instead of
+# re-reading the row, so changes made meanwhile by other transactions are
+# not seen. Sessions live for one request; call db.refresh() or
+# db.expire_all() where a fresh read is needed.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Async stack for endpoints that should not hold a threadpool thread while
+# waiting on Postgres. Objects stay usable after commit, since lazy loads
+# are not possible on an AsyncSession anyway.
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    pool_size=settings.ASYNC_DB_POOL_SIZE,
+    max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Per-request statement counts for the access log
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
 
 Base = declarative_base()
 
@@ -13,3 +38,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,3 +1,9 @@
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException, status
+
+from app.core.logging.log_settings import log_settings
 from app.core.logging.log_service import LogService
 
 # Singleton instance
@@ -7,3 +13,10 @@ _log_service = LogService()
 def get_log_service() -> LogService:
     """FastAPI Depends() compatible dependency for LogService injection."""
     return _log_service
+
+
+def require_log_query_key(x_log_api_key: Optional[str] = Header(None)) -> None:
+    """Guard the log query API; logs hold user data, so it is closed unless a key is configured."""
+    expected = log_settings.LOG_QUERY_API_KEY
+    if not expected or not x_log_api_key or not secrets.compare_digest(x_log_api_key, expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid log API key")
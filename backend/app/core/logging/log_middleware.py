@@ -2,81 +2,97 @@ import time
 import logging
 from uuid import uuid4
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.logging.log_context import set_trace_id, set_actor
-from app.core.logging.log_schema import ActorContext, HttpContext
+from app.core.metrics import UNMATCHED_ROUTE, observe_request
+from app.core.query_stats import QueryStats, start_query_stats
+from app.core.logging.log_schema import ActorContext
 from app.core.logging.log_service import LogService
+from app.core.logging.sampling import HttpSampler, http_sampler
 
 logger = logging.getLogger("log_middleware")
 
+# Polled by load balancers and scrapers; neither logged nor measured
+UNLOGGED_PATHS = {"/health", "/metrics"}
 
-class LogMiddleware(BaseHTTPMiddleware):
-    """HTTP middleware that logs every request/response and propagates trace_id."""
 
-    def __init__(self, app, log_service: LogService | None = None):
-        super().__init__(app)
+class LogMiddleware:
+    """
+    HTTP middleware that logs every request/response and propagates trace_id.
+
+    Plain ASGI rather than BaseHTTPMiddleware: the endpoint runs in the same
+    task (so contextvars set here are visible to it and vice versa) and the
+    response body is passed through untouched, which keeps streaming intact.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        log_service: LogService | None = None,
+        sampler: HttpSampler | None = None,
+    ):
+        self.app = app
         self.log_service = log_service or LogService()
+        self.sampler = sampler or http_sampler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next) -> Response:
         # --- Request phase ---
-        trace_id = request.headers.get("X-Trace-Id") or str(uuid4())
+        headers = Headers(scope=scope)
+        trace_id = headers.get("X-Trace-Id") or str(uuid4())
         set_trace_id(trace_id)
 
         # Try to extract actor from request state (set by auth dependency)
-        actor = None
-        if hasattr(request.state, "user"):
-            user = request.state.user
-            actor = ActorContext(
+        user = scope.get("state", {}).get("user")
+        if user is not None:
+            set_actor(ActorContext(
                 user_id=str(getattr(user, "id", None)),
                 email=getattr(user, "email", None),
                 role=getattr(user, "type", None),
-            )
-            set_actor(actor)
+            ))
+
+        # Skip logging for healthcheck to avoid hitting DB and blocking the LB
+        if scope["path"] in UNLOGGED_PATHS:
+            await self.app(scope, receive, send)
+            return
 
         start_time = time.perf_counter()
+        status_code = 500
+        query_stats = start_query_stats()
 
-        # Skip logging for healthcheck to avoid hitting DB and blocking the LB
-        if request.url.path == "/health":
-            return await call_next(request)
+        async def send_with_trace_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Inject trace_id into response header for frontend correlation
+                MutableHeaders(scope=message)["X-Trace-Id"] = trace_id
+            await send(message)
 
         # --- Process request ---
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_trace_id)
         except Exception as exc:
             # Unhandled exception during request processing
             duration_ms = (time.perf_counter() - start_time) * 1000
-            http_ctx = HttpContext(
-                method=request.method,
-                path=str(request.url.path),
-                status_code=500,
-                duration_ms=round(duration_ms, 2),
-                user_agent=request.headers.get("user-agent"),
-                ip=request.client.host if request.client else None,
-            )
+            observe_request(scope["method"], self._route(scope), 500, duration_ms / 1000)
             await self.log_service.error(
                 action="HTTP_REQUEST",
-                message=f"{request.method} {request.url.path} 500 {duration_ms:.0f}ms",
+                message=f"{scope['method']} {scope['path']} 500 {duration_ms:.0f}ms",
                 error=exc,
                 category="http",
-                http=http_ctx,
+                http=self._http_context(scope, headers, 500, duration_ms, query_stats),
             )
             raise
 
         # --- Response phase ---
         duration_ms = (time.perf_counter() - start_time) * 1000
-        status_code = response.status_code
-
-        http_ctx = HttpContext(
-            method=request.method,
-            path=str(request.url.path),
-            status_code=status_code,
-            duration_ms=round(duration_ms, 2),
-            user_agent=request.headers.get("user-agent"),
-            ip=request.client.host if request.client else None,
-        )
+        # Every request is measured; sampling below only thins out the logs
+        observe_request(scope["method"], self._route(scope), status_code, duration_ms / 1000)
 
         # Determine log level based on status code
         if status_code < 400:
@@ -86,16 +102,38 @@ class LogMiddleware(BaseHTTPMiddleware):
         else:
             level = "error"
 
-        msg = f"{request.method} {request.url.path} {status_code} {duration_ms:.0f}ms"
-
-        if level == "info":
-            await self.log_service.info(action="HTTP_REQUEST", message=msg, category="http", http=http_ctx)
-        elif level == "warn":
-            await self.log_service.warn(action="HTTP_REQUEST", message=msg, category="http", http=http_ctx)
-        else:
-            await self.log_service.error(action="HTTP_REQUEST", message=msg, category="http", http=http_ctx)
-
-        # Inject trace_id into response header for frontend correlation
-        response.headers["X-Trace-Id"] = trace_id
-
-        return response
+        keep, sampling = self.sampler.decide(scope["method"], scope["path"], level, duration_ms)
+        if not keep:
+            return
+
+        http_ctx = self._http_context(scope, headers, status_code, duration_ms, query_stats)
+        msg = f"{scope['method']} {scope['path']} {status_code} {duration_ms:.0f}ms"
+        log = getattr(self.log_service, level)
+        await log(action="HTTP_REQUEST", message=msg, category="http", http=http_ctx, sampling=sampling)
+
+    @staticmethod
+    def _route(scope: Scope) -> str:
+        """Template of the route the router matched (it stores it in the shared scope)."""
+        if scope.get("route") is None:
+            return UNMATCHED_ROUTE
+        # Newer FastAPI keeps included routers nested, so the matched route's
+        # own path lacks their prefixes; the match context has the full one
+        context = scope.get("fastapi", {}).get("effective_route_context")
+        return getattr(context, "path_format", None) or getattr(scope["route"], "path", UNMATCHED_ROUTE)
+
+    @staticmethod
+    def _http_context(
+        scope: Scope, headers: Headers, status_code: int, duration_ms: float, query_stats: QueryStats
+    ) -> dict:
+        """The `http` sub-document, laid out like HttpContext."""
+        client = scope.get("client")
+        return {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status_code": status_code,
+            "duration_ms": round(duration_ms, 2),
+            "user_agent": headers.get("user-agent"),
+            "ip": client[0] if client else None,
+            "db_query_count": query_stats.count,
+            "db_time_ms": round(query_stats.duration_ms, 2),
+        }
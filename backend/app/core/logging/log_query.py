@@ -0,0 +1,146 @@
+"""Read path for stored logs.
+
+Every query is an equality prefix plus a (timestamp, _id) range, hinted to
+the LOG_INDEXES entry built for it. Pages are keyset-paginated: the cursor
+is the (timestamp, _id) of the last document returned, and the next page
+starts strictly after it, so no page costs a skip over earlier ones.
+
+Pages are streamed as `{"items": [...], "next_cursor": ...}`, one document
+at a time as the Mongo cursor yields them.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class LogQuery:
+    filter: dict
+    hint: str
+    direction: int = DESCENDING
+
+
+def trace_query(trace_id: str) -> LogQuery:
+    """Everything logged for one request, oldest first."""
+    return LogQuery({"trace_id": trace_id}, "trace_timestamp", ASCENDING)
+
+
+def errors_query(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    category: Optional[str] = None,
+) -> LogQuery:
+    """Error logs in [start, end), newest first."""
+    if category is None:
+        return LogQuery({"level": "error", **_time_range(start, end)}, "level_timestamp")
+    return LogQuery(
+        {"category": category, "level": "error", **_time_range(start, end)}, "category_level_timestamp"
+    )
+
+
+def audit_trail_query(
+    user_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None
+) -> LogQuery:
+    """Audit logs of one user in [start, end), newest first."""
+    return LogQuery(
+        {"actor.user_id": user_id, "level": "audit", **_time_range(start, end)}, "actor_timestamp"
+    )
+
+
+def _time_range(start: Optional[datetime], end: Optional[datetime]) -> dict:
+    bounds = {}
+    if start is not None:
+        bounds["$gte"] = start
+    if end is not None:
+        bounds["$lt"] = end
+    return {"timestamp": bounds} if bounds else {}
+
+
+def encode_cursor(doc: dict) -> str:
+    raw = f"{doc['timestamp'].isoformat()}|{doc['_id']}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, _, object_id = raw.partition("|")
+        return datetime.fromisoformat(timestamp), ObjectId(object_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, InvalidId):
+        raise InvalidCursor(cursor)
+
+
+def page_filter(query: LogQuery, cursor: Optional[str]) -> dict:
+    """The query's filter, restricted to documents after `cursor` in sort order."""
+    if cursor is None:
+        return query.filter
+    timestamp, object_id = decode_cursor(cursor)
+    op, op_or_equal = ("$gt", "$gte") if query.direction == ASCENDING else ("$lt", "$lte")
+    # The inclusive bound on timestamp alone keeps the index scan a range;
+    # the $or only breaks ties between documents with the same timestamp.
+    bounds = {**query.filter.get("timestamp", {}), op_or_equal: timestamp}
+    return {
+        **query.filter,
+        "timestamp": bounds,
+        "$or": [{"timestamp": {op: timestamp}}, {"_id": {op: object_id}}],
+    }
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, default=_json_default, separators=(",", ":")).encode()
+
+
+async def stream_page(
+    collection: AsyncIOMotorCollection, query: LogQuery, cursor: Optional[str], limit: int
+) -> AsyncIterator[bytes]:
+    """
+    Yield one page as JSON chunks; raises InvalidCursor before the first chunk.
+
+    One extra document is read to tell whether there is a next page.
+    """
+    direction = query.direction
+    documents = collection.find(
+        page_filter(query, cursor),
+        sort=[("timestamp", direction), ("_id", direction)],
+        limit=limit + 1,
+        batch_size=min(limit + 1, 500),
+        hint=query.hint,
+    )
+    separator = b'{"items":['
+    last, next_cursor = None, None
+    count = 0
+    try:
+        async for doc in documents:
+            if count == limit:
+                next_cursor = encode_cursor(last)
+                break
+            yield separator + _encode(doc)
+            separator = b","
+            last = doc
+            count += 1
+    finally:
+        # Also reached when the client disconnects mid-page
+        await documents.close()
+    if count == 0:
+        yield separator
+    yield b'],"next_cursor":' + _encode(next_cursor) + b"}"
@@ -1,7 +1,9 @@
 import logging
-from typing import Optional
+from typing import List, Optional
 
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
 
 from app.core.logging.log_settings import log_settings
 
@@ -10,6 +12,48 @@ logger = logging.getLogger("log_repository")
 _client: Optional[AsyncIOMotorClient] = None
 _db: Optional[AsyncIOMotorDatabase] = None
 
+# One index per query shape. Time-ordered ones end in `_id` so listings
+# sorted by (timestamp, _id) can page on an index range.
+LOG_INDEXES = [
+    # Everything logged for one request, in order
+    IndexModel(
+        [("trace_id", ASCENDING), ("timestamp", ASCENDING), ("_id", ASCENDING)],
+        name="trace_timestamp",
+    ),
+    # "errors over time", optionally within a category
+    IndexModel(
+        [("level", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+        name="level_timestamp",
+    ),
+    IndexModel(
+        [("category", ASCENDING), ("level", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+        name="category_level_timestamp",
+    ),
+    # A user's trail; anonymous logs (most HTTP traffic) stay out of it
+    IndexModel(
+        [("actor.user_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+        name="actor_timestamp",
+        partialFilterExpression={"actor.user_id": {"$type": "string"}},
+    ),
+    IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)], name="timestamp"),
+    # TTL. Partial rather than sparse: error/audit logs store expires_at as
+    # null, which a sparse index would still hold.
+    IndexModel(
+        [("expires_at", ASCENDING)],
+        name="expires_at_ttl",
+        expireAfterSeconds=0,
+        partialFilterExpression={"expires_at": {"$type": "date"}},
+    ),
+]
+
+# Created by earlier releases; dropped on startup
+RETIRED_LOG_INDEXES = {
+    "trace_id_1", "level_1", "category_1", "action_1", "actor.user_id_1", "timestamp_1",
+    "http.status_code_1", "environment_1", "expires_at_1",
+}
+
+INDEX_NOT_FOUND = 27
+
 
 def get_mongo_client() -> AsyncIOMotorClient:
     """Get or create the Motor client singleton."""
@@ -33,38 +77,60 @@ def get_log_database() -> AsyncIOMotorDatabase:
     return _db
 
 
-async def insert_log(document: dict) -> None:
-    """Insert a single log document into MongoDB. Never raises."""
-    try:
-        db = get_log_database()
-        collection = db[log_settings.LOG_COLLECTION_NAME]
-        await collection.insert_one(document)
-    except Exception as e:
-        logger.error(f"Failed to write log to MongoDB: {e}")
+def get_log_collection() -> AsyncIOMotorCollection:
+    return get_log_database()[log_settings.LOG_COLLECTION_NAME]
+
+
+async def insert_logs(documents: List[dict]) -> None:
+    """
+    Insert a batch of log documents in one round trip.
+
+    Unordered, so one bad document does not stop the rest; failures raise
+    (a BulkWriteError lists the documents that were rejected).
+    """
+    await get_log_collection().insert_many(documents, ordered=False)
+
+
+def _index_spec(info: dict) -> tuple:
+    """Comparable form of an index: its key plus the options we set."""
+    key = info["key"]
+    options = {k: v for k, v in info.items() if k not in ("key", "name", "v", "ns")}
+    return list(key.items() if isinstance(key, dict) else key), options
+
+
+async def reconcile_log_indexes(collection: AsyncIOMotorCollection) -> None:
+    """
+    Bring the collection's indexes in line with LOG_INDEXES.
+
+    Drops retired indexes and any of ours whose definition changed, then
+    creates what is missing. Indexes added by hand under other names are
+    left alone. Safe to run from several workers at once.
+    """
+    existing = await collection.index_information()
+    wanted = {model.document["name"]: model for model in LOG_INDEXES}
+
+    stale = [name for name in existing if name in RETIRED_LOG_INDEXES]
+    stale += [
+        name for name, model in wanted.items()
+        if name in existing and _index_spec(existing[name]) != _index_spec(model.document)
+    ]
+    for name in stale:
+        try:
+            await collection.drop_index(name)
+            logger.info(f"Dropped MongoDB log index {name}")
+        except OperationFailure as e:
+            if e.code != INDEX_NOT_FOUND:  # another worker dropped it first
+                raise
+
+    missing = [model for name, model in wanted.items() if name not in existing or name in stale]
+    if missing:
+        await collection.create_indexes(missing)
 
 
 async def create_log_indexes() -> None:
     """Create MongoDB indexes for efficient querying and TTL rotation."""
     try:
-        db = get_log_database()
-        collection = db[log_settings.LOG_COLLECTION_NAME]
-
-        await collection.create_index("trace_id")
-        await collection.create_index("level")
-        await collection.create_index("category")
-        await collection.create_index("action")
-        await collection.create_index("actor.user_id")
-        await collection.create_index("timestamp")
-        await collection.create_index("http.status_code")
-        await collection.create_index("environment")
-
-        # TTL index — documents with expires_at are auto-removed
-        await collection.create_index(
-            "expires_at",
-            expireAfterSeconds=0,
-            sparse=True,
-        )
-
+        await reconcile_log_indexes(get_log_collection())
         logger.info("MongoDB log indexes created successfully.")
     except Exception as e:
         logger.error(f"Failed to create MongoDB indexes: {e}")
@@ -12,6 +12,8 @@ class HttpContext(BaseModel):
     user_agent: Optional[str] = None
     ip: Optional[str] = None
     query_params: Optional[dict] = None
+    db_query_count: Optional[int] = None
+    db_time_ms: Optional[float] = None
 
 
 class ActorContext(BaseModel):
@@ -21,6 +23,13 @@ class ActorContext(BaseModel):
     session_id: Optional[str] = None
 
 
+class SamplingDecision(BaseModel):
+    """How a sampled access log was kept; weight each document by 1 / rate to rebuild counts."""
+    rule: str
+    rate: float
+    reason: Literal["sampled", "error", "slow"]
+
+
 class ErrorDetail(BaseModel):
     name: str
     message: str
@@ -30,6 +39,8 @@ class ErrorDetail(BaseModel):
 
 
 class LogDocument(BaseModel):
+    """Layout of a stored log; LogService builds these as plain dicts without validation."""
+
     # Identification
     trace_id: str = Field(default_factory=lambda: str(uuid4()))
     correlation_id: Optional[str] = None
@@ -48,6 +59,7 @@ class LogDocument(BaseModel):
     http: Optional[HttpContext] = None
     actor: Optional[ActorContext] = None
     error: Optional[ErrorDetail] = None
+    sampling: Optional[SamplingDecision] = None
 
     # Payload
     message: str
@@ -1,23 +1,16 @@
-import asyncio
-import logging
 import traceback
 from datetime import datetime, timedelta
 from typing import Any, Optional
 from uuid import uuid4
 
-from app.core.logging.log_schema import (
-    ActorContext,
-    ErrorDetail,
-    HttpContext,
-    LogDocument,
-)
+from pydantic import BaseModel
+
+from app.core.logging.log_schema import ActorContext, ErrorDetail, HttpContext, SamplingDecision
 from app.core.logging.log_context import get_trace_id, get_actor
-from app.core.logging.log_repository import insert_log
+from app.core.logging.log_writer import log_writer
 from app.core.logging.log_settings import log_settings
 from app.core.logging.sanitizer import sanitize
 
-logger = logging.getLogger("fallback")
-
 # TTL mapping (days → timedelta)
 _TTL_MAP = {
     "debug": log_settings.LOG_TTL_DEBUG_DAYS,
@@ -26,12 +19,19 @@ _TTL_MAP = {
 }
 
 
-def _compute_expires_at(level: str) -> Optional[datetime]:
+def _compute_expires_at(level: str, now: Optional[datetime] = None) -> Optional[datetime]:
     """Compute expiration datetime based on log level. Error/audit never expire."""
     days = _TTL_MAP.get(level)
     if days is None:
         return None  # error and audit never expire
-    return datetime.utcnow() + timedelta(days=days)
+    return (now or datetime.utcnow()) + timedelta(days=days)
+
+
+def _as_dict(context: Any) -> Optional[dict]:
+    """Accept a schema model or an already-built dict for a nested context."""
+    if isinstance(context, BaseModel):
+        return context.model_dump()
+    return context
 
 
 class LogService:
@@ -43,55 +43,53 @@ class LogService:
         action: str,
         message: str,
         category: str = "system",
-        http: Optional[HttpContext] = None,
-        actor: Optional[ActorContext] = None,
-        error: Optional[ErrorDetail] = None,
+        http: HttpContext | dict | None = None,
+        actor: ActorContext | dict | None = None,
+        error: ErrorDetail | dict | None = None,
         metadata: Optional[dict[str, Any]] = None,
         service: str = "backend",
         trace_id: Optional[str] = None,
-    ) -> LogDocument:
-        # Use context vars if not explicitly provided
-        resolved_trace_id = trace_id or get_trace_id() or str(uuid4())
-        resolved_actor = actor or get_actor()
-
-        # Sanitize metadata
-        sanitized_metadata = sanitize(metadata) if metadata else None
-
-        return LogDocument(
-            trace_id=resolved_trace_id,
-            level=level,
-            category=category,
-            action=action,
-            service=service,
-            environment=log_settings.ENVIRONMENT,
-            version=log_settings.APP_VERSION,
-            http=http,
-            actor=resolved_actor,
-            error=error,
-            message=message,
-            metadata=sanitized_metadata,
-            expires_at=_compute_expires_at(level),
-        )
-
-    _background_tasks = set()
-
-    def _fire_and_forget(self, doc: LogDocument) -> None:
-        """Schedule the async insert without awaiting — truly non-blocking."""
-        try:
-            loop = asyncio.get_running_loop()
-            task = loop.create_task(self._safe_insert(doc))
-            self._background_tasks.add(task)
-            task.add_done_callback(self._background_tasks.discard)
-        except RuntimeError:
-            # No running loop (e.g. called from sync context)
-            logger.warning(f"[{doc.level.upper()}] {doc.action}: {doc.message}")
-
-    async def _safe_insert(self, doc: LogDocument) -> None:
-        """Insert with full fallback to stdlib logging."""
-        try:
-            await insert_log(doc.model_dump(mode="json"))
-        except Exception as e:
-            logger.error(f"Fallback log — failed to persist: {e} | {doc.action}: {doc.message}")
+        sampling: SamplingDecision | dict | None = None,
+    ) -> dict:
+        """
+        Build a BSON-ready document with the LogDocument layout.
+
+        Plain dicts with real datetimes, so the TTL index on `expires_at`
+        applies; callers are trusted, input is validated at the HTTP ingress.
+        """
+        now = datetime.utcnow()
+        return {
+            # Use context vars if not explicitly provided
+            "trace_id": trace_id or get_trace_id() or str(uuid4()),
+            "correlation_id": None,
+            "level": level,
+            "category": category,
+            "action": action,
+            "service": service,
+            "environment": log_settings.ENVIRONMENT,
+            "version": log_settings.APP_VERSION,
+            "http": _as_dict(http),
+            "actor": _as_dict(actor or get_actor()),
+            "error": _as_dict(error),
+            "sampling": _as_dict(sampling),
+            "message": message,
+            "metadata": sanitize(metadata) if metadata else None,
+            "timestamp": now,
+            "expires_at": _compute_expires_at(level, now),
+        }
+
+    def _fire_and_forget(self, doc: dict) -> None:
+        """Hand the document to the batching writer — truly non-blocking, from any thread."""
+        log_writer.enqueue_threadsafe(doc)
+
+    def log_nowait(
+        self, level: str, action: str, message: str, category: str = "system", **kwargs: Any
+    ) -> None:
+        """Synchronous logging for code that cannot await, e.g. hooks on a threadpool thread."""
+        if level == "debug" and log_settings.ENVIRONMENT == "production":
+            return
+        doc = self._build_document(level, action, message, category, **kwargs)
+        self._fire_and_forget(doc)
 
     async def info(
         self, action: str, message: str, category: str = "system", **kwargs: Any
@@ -116,11 +114,11 @@ class LogService:
         error_detail = None
         if error is not None:
             include_stack = log_settings.ENVIRONMENT != "production"
-            error_detail = ErrorDetail(
-                name=type(error).__name__,
-                message=str(error),
-                stack_trace=traceback.format_exc() if include_stack else None,
-            )
+            error_detail = {
+                "name": type(error).__name__,
+                "message": str(error),
+                "stack_trace": traceback.format_exc() if include_stack else None,
+            }
         doc = self._build_document(
             "error", action, message, category, error=error_detail, **kwargs
         )
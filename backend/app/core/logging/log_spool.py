@@ -0,0 +1,146 @@
+"""Append-only disk spool for log documents that could not reach MongoDB.
+
+Documents are stored as length-prefixed JSON lines (`<bytes>:<extended
+JSON>\\n`) in segment files named `<pid>-<seq>.<state>`:
+
+- `open`: the segment this worker is appending to;
+- `ready`: sealed, waiting to be replayed by any worker;
+- `replay`: claimed by the worker replaying it.
+
+A segment is sealed once it reaches the segment size cap, or when the
+replayer needs it. Segments left `open` or `replay` by a worker that is no
+longer running are returned to `ready` on startup. Every document gets its
+`_id` before it is spooled, so a segment replayed twice does not duplicate
+anything.
+"""
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from bson import ObjectId, json_util
+
+logger = logging.getLogger("log_spool")
+
+OPEN, READY, REPLAY = "open", "ready", "replay"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class LogSpool:
+    def __init__(self, directory: str, segment_max_bytes: int, max_total_bytes: int):
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.max_total_bytes = max_total_bytes
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._open: Optional[Path] = None
+        self._open_bytes = 0
+        self._seq = 0
+        self._recovered = False
+
+    def _recover(self) -> None:
+        """Create the directory and release segments of dead workers."""
+        if self._recovered:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in self.directory.iterdir():
+            pid, seq, state = self._parse(path)
+            if pid is None:
+                continue
+            if pid == self._pid:
+                self._seq = max(self._seq, seq + 1)
+            # Our own pid here means a previous process that had the same pid
+            if state in (OPEN, REPLAY) and (pid == self._pid or not _pid_alive(pid)):
+                path.rename(path.with_suffix(f".{READY}"))
+        self._recovered = True
+
+    @staticmethod
+    def _parse(path: Path) -> Tuple[Optional[int], int, str]:
+        stem, _, state = path.name.partition(".")
+        pid, _, seq = stem.partition("-")
+        if state not in (OPEN, READY, REPLAY) or not (pid.isdigit() and seq.isdigit()):
+            return None, 0, ""
+        return int(pid), int(seq), state
+
+    def size_bytes(self) -> int:
+        if not self.directory.is_dir():
+            return 0
+        return sum(p.stat().st_size for p in self.directory.iterdir() if self._parse(p)[0] is not None)
+
+    def append(self, documents: List[dict]) -> bool:
+        """Spool documents; returns False if the spool is full."""
+        with self._lock:
+            self._recover()
+            records = []
+            for doc in documents:
+                doc.setdefault("_id", ObjectId())
+                payload = json_util.dumps(doc).encode()
+                records.append(b"%d:%s\n" % (len(payload), payload))
+            data = b"".join(records)
+            if self.size_bytes() + len(data) > self.max_total_bytes:
+                return False
+
+            if self._open is None or self._open_bytes >= self.segment_max_bytes:
+                self._seal()
+                self._open = self.directory / f"{self._pid}-{self._seq:08d}.{OPEN}"
+                self._seq += 1
+                self._open_bytes = 0
+            with open(self._open, "ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self._open_bytes += len(data)
+            return True
+
+    def _seal(self) -> None:
+        if self._open is not None:
+            self._open.rename(self._open.with_suffix(f".{READY}"))
+            self._open = None
+
+    def claim(self) -> Optional[Tuple[Path, List[dict]]]:
+        """Take a sealed segment for replay, sealing our own if there is none."""
+        with self._lock:
+            self._recover()
+            ready = sorted(self.directory.glob(f"*.{READY}"))
+            if not ready and self._open is not None:
+                sealed = self._open.with_suffix(f".{READY}")
+                self._seal()
+                ready = [sealed]
+            for path in ready:
+                claimed = path.with_name(f"{path.stem}.{REPLAY}")
+                try:
+                    path.rename(claimed)
+                except FileNotFoundError:
+                    continue  # another worker got it first
+                return claimed, self._read(claimed)
+            return None
+
+    def release(self, path: Path, replayed: bool) -> None:
+        """Delete a replayed segment, or hand it back for a later attempt."""
+        if replayed:
+            path.unlink(missing_ok=True)
+        else:
+            path.rename(path.with_suffix(f".{READY}"))
+
+    @staticmethod
+    def _read(path: Path) -> List[dict]:
+        documents = []
+        with open(path, "rb") as f:
+            for line in f:
+                size, _, payload = line.rstrip(b"\n").partition(b":")
+                if not size.isdigit() or int(size) != len(payload):
+                    # Torn write from a crash; nothing after it can be trusted
+                    logger.warning(f"Truncated record in log spool segment {path.name}; skipping the rest")
+                    break
+                documents.append(json_util.loads(payload))
+        return documents
@@ -0,0 +1,319 @@
+"""Background writer that batches log documents into MongoDB.
+
+Documents are buffered in a bounded in-memory queue and written with one
+`insert_many` per batch, either as soon as LOG_BATCH_SIZE documents are
+waiting or every LOG_BATCH_FLUSH_MS, whichever comes first.
+
+The queue never grows past LOG_QUEUE_MAX_SIZE, so a slow or unreachable
+Mongo costs at most that many documents of memory. What happens to a
+document that does not fit is set by LOG_OVERFLOW_POLICY:
+
+- "drop_low_priority": debug/info documents are dropped, oldest queued
+  ones first, to make room for warn and above. Error and audit documents
+  are never dropped; if no room can be made they go to the stdlib logger.
+- "fallback": every document that does not fit goes to the stdlib logger.
+
+When a batch cannot reach Mongo it is appended to the disk spool (see
+log_spool), and later batches go straight to the spool instead of waiting
+on a dead connection. A replayer task drains the spool in bulk every
+LOG_SPOOL_REPLAY_INTERVAL_MS and switches writes back to Mongo once a
+replay succeeds.
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, List, Optional
+
+from app.core.logging.log_repository import insert_logs
+from app.core.logging.log_settings import log_settings
+from app.core.logging.log_spool import LogSpool
+
+logger = logging.getLogger("fallback")
+
+Sink = Callable[[List[dict]], Awaitable[None]]
+
+DROP_LOW_PRIORITY = "drop_low_priority"
+FALLBACK = "fallback"
+
+LOW_PRIORITY_LEVELS = {"debug", "info"}
+NEVER_DROPPED_LEVELS = {"error", "audit"}
+
+DUPLICATE_KEY = 11000
+
+
+class LogWriter:
+    """Bounded queue drained by a single background task on the event loop."""
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval_ms: int,
+        max_queue_size: int,
+        drain_timeout_ms: int,
+        overflow_policy: str = DROP_LOW_PRIORITY,
+        sink: Sink = insert_logs,
+        spool: Optional[LogSpool] = None,
+        replay_interval_ms: int = 5000,
+    ):
+        if overflow_policy not in (DROP_LOW_PRIORITY, FALLBACK):
+            raise ValueError(f"Unknown log overflow policy: {overflow_policy}")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_queue_size = max_queue_size
+        self.drain_timeout = drain_timeout_ms / 1000
+        self.overflow_policy = overflow_policy
+        self._sink = sink
+        self._spool = spool
+        self.replay_interval = replay_interval_ms / 1000
+        # False after Mongo was unreachable, until a spool replay succeeds
+        self._sink_healthy = True
+        # Kept apart so low-priority documents can be shed without a scan
+        self._low: deque = deque()
+        self._high: deque = deque()
+        self._in_flight: List[dict] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._replay_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.queued = 0
+        self.written = 0
+        self.dropped = 0
+        self.fallback = 0
+        self.failed = 0
+        self.spooled = 0
+        self.replayed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def queue_size(self) -> int:
+        return len(self._low) + len(self._high)
+
+    def enqueue(self, document: dict) -> bool:
+        """Buffer a document; returns False if it was not queued for Mongo."""
+        if not self.running:
+            self._fall_back(document)
+            return False
+
+        level = document.get("level")
+        if self.queue_size >= self.max_queue_size and not self._make_room(level):
+            if self.overflow_policy == DROP_LOW_PRIORITY and level not in NEVER_DROPPED_LEVELS:
+                self.dropped += 1
+            else:
+                self._fall_back(document)
+            return False
+
+        (self._low if level in LOW_PRIORITY_LEVELS else self._high).append(document)
+        self.queued += 1
+        if self.queue_size >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def enqueue_threadsafe(self, document: dict) -> None:
+        """`enqueue` for callers that may be on a threadpool thread rather than the loop."""
+        loop = self._loop
+        if loop is None or not self.running:
+            self._fall_back(document)
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self.enqueue(document)
+        else:
+            loop.call_soon_threadsafe(self.enqueue, document)
+
+    def _make_room(self, level: Optional[str]) -> bool:
+        """Shed the oldest low-priority document for a more important one."""
+        if self.overflow_policy != DROP_LOW_PRIORITY or level in LOW_PRIORITY_LEVELS or not self._low:
+            return False
+        self._low.popleft()
+        self.dropped += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "queue_size": self.queue_size,
+            "max_queue_size": self.max_queue_size,
+            "overflow_policy": self.overflow_policy,
+            "queued": self.queued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "fallback": self.fallback,
+            "failed": self.failed,
+            "spooled": self.spooled,
+            "replayed": self.replayed,
+            "sink_healthy": self._sink_healthy,
+            "spool_bytes": self._spool.size_bytes() if self._spool else 0,
+        }
+
+    def start(self) -> None:
+        """Start the flush loop on the running event loop."""
+        if self.running:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        loop = self._loop = asyncio.get_running_loop()
+        self._task = loop.create_task(self._run())
+        if self._spool is not None:
+            self._replay_task = loop.create_task(self._replay_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and drain whatever is still queued."""
+        if not self.running:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=self.drain_timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._task = None
+        if self._replay_task is not None:
+            self._replay_task.cancel()
+            self._replay_task = None
+        unwritten = self._in_flight + self._take(self.queue_size)
+        self._in_flight = []
+        if unwritten:
+            self._divert(unwritten, "log writer stopped before draining")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._flush()
+            if self._stopping:
+                return
+
+    async def _flush(self) -> None:
+        while self.queue_size:
+            batch = self._take(self.batch_size)
+            if self._sink_healthy or self._spool is None:
+                await self._write(batch)
+            else:
+                self._in_flight = batch
+                await asyncio.to_thread(self._divert, batch, "MongoDB unavailable")
+                self._in_flight = []
+
+    def _take(self, count: int) -> List[dict]:
+        batch = []
+        for queue in (self._high, self._low):
+            while queue and len(batch) < count:
+                batch.append(queue.popleft())
+        return batch
+
+    async def _write(self, batch: List[dict]) -> None:
+        self._in_flight = batch
+        try:
+            await self._sink(batch)
+            self.written += len(batch)
+        except Exception as e:
+            rejected = self._rejected(e, batch)
+            if rejected is None:
+                # Mongo unreachable: keep the batch on disk for the replayer
+                self._sink_healthy = False
+                await asyncio.to_thread(self._divert, batch, str(e))
+            else:
+                self.written += len(batch) - len(rejected)
+                self._report_failed(rejected, str(e))
+        # Left set if the write is cancelled, so `stop` can still report it
+        self._in_flight = []
+
+    @staticmethod
+    def _rejected(error: Exception, batch: List[dict]) -> Optional[List[dict]]:
+        """
+        Documents the server refused, or None if the batch never got there.
+
+        An unordered bulk insert reports exactly which documents failed;
+        duplicate keys mean a replayed document was already stored.
+        """
+        details = getattr(error, "details", None) or {}
+        if "writeErrors" not in details:
+            return None
+        return [batch[err["index"]] for err in details["writeErrors"] if err.get("code") != DUPLICATE_KEY]
+
+    def _divert(self, documents: List[dict], reason: str) -> None:
+        """Spool documents Mongo could not take, or report them if that fails too."""
+        try:
+            spooled = self._spool is not None and self._spool.append(documents)
+        except OSError as e:
+            spooled = False
+            reason = f"{reason}; spool write failed: {e}"
+        if spooled:
+            self.spooled += len(documents)
+        else:
+            self._report_failed(documents, reason)
+
+    async def _replay_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.replay_interval)
+            try:
+                await self._replay()
+            except OSError as e:
+                logger.error(f"Log spool replay failed: {e}")
+
+    async def _replay(self) -> None:
+        """Write spooled segments back to Mongo until the spool is empty or Mongo fails."""
+        while True:
+            claimed = await asyncio.to_thread(self._spool.claim)
+            if claimed is None:
+                self._sink_healthy = True
+                return
+            path, documents = claimed
+            try:
+                replayed = await self._replay_segment(documents)
+            except asyncio.CancelledError:
+                self._spool.release(path, replayed=False)
+                raise
+            await asyncio.to_thread(self._spool.release, path, replayed)
+            if not replayed:
+                self._sink_healthy = False
+                return
+            self.replayed += len(documents)
+
+    async def _replay_segment(self, documents: List[dict]) -> bool:
+        for start in range(0, len(documents), self.batch_size):
+            batch = documents[start:start + self.batch_size]
+            try:
+                await self._sink(batch)
+            except Exception as e:
+                rejected = self._rejected(e, batch)
+                if rejected is None:
+                    return False
+                self._report_failed(rejected, str(e))
+        return True
+
+    def _fall_back(self, document: dict) -> None:
+        self.fallback += 1
+        logger.warning(
+            f"[{str(document.get('level')).upper()}] {document.get('action')}: {document.get('message')}"
+        )
+
+    def _report_failed(self, documents: List[dict], reason: str) -> None:
+        self.failed += len(documents)
+        for doc in documents:
+            logger.error(
+                f"Fallback log — failed to persist: {reason} | {doc.get('action')}: {doc.get('message')}"
+            )
+
+
+log_writer = LogWriter(
+    batch_size=log_settings.LOG_BATCH_SIZE,
+    flush_interval_ms=log_settings.LOG_BATCH_FLUSH_MS,
+    max_queue_size=log_settings.LOG_QUEUE_MAX_SIZE,
+    drain_timeout_ms=log_settings.LOG_DRAIN_TIMEOUT_MS,
+    overflow_policy=log_settings.LOG_OVERFLOW_POLICY,
+    spool=LogSpool(
+        log_settings.LOG_SPOOL_DIR,
+        segment_max_bytes=log_settings.LOG_SPOOL_SEGMENT_MAX_BYTES,
+        max_total_bytes=log_settings.LOG_SPOOL_MAX_BYTES,
+    ) if log_settings.LOG_SPOOL_DIR else None,
+    replay_interval_ms=log_settings.LOG_SPOOL_REPLAY_INTERVAL_MS,
+)
@@ -0,0 +1,54 @@
+"""Per-route sampling of HTTP access logs.
+
+Rules come from LogSettings.LOG_SAMPLING_RULES and are compiled once. The
+first rule whose path pattern and method match applies, and only samples
+the levels it lists; everything else is always logged. Error and slow
+requests are kept even when a rule matches. Documents a rule applied to
+carry a `sampling` sub-document (laid out like SamplingDecision), so
+totals can be rebuilt as sum(1 / rate) with a weight of 1 for documents
+without one.
+"""
+import random
+import re
+from fnmatch import translate
+from typing import Callable, List, Optional, Tuple
+
+from app.core.logging.log_settings import SamplingRule, log_settings
+
+
+class HttpSampler:
+    def __init__(
+        self,
+        rules: List[SamplingRule],
+        slow_request_ms: float,
+        rand: Callable[[], float] = random.random,
+    ):
+        self._rules = [
+            (re.compile(translate(rule.path)), {m.upper() for m in rule.methods}, set(rule.levels), rule)
+            for rule in rules
+        ]
+        self.slow_request_ms = slow_request_ms
+        self._rand = rand
+
+    def decide(
+        self, method: str, path: str, level: str, duration_ms: float
+    ) -> Tuple[bool, Optional[dict]]:
+        """Whether to log this request, and the decision to record on its document."""
+        for pattern, methods, levels, rule in self._rules:
+            if method in methods and pattern.match(path):
+                break
+        else:
+            return True, None
+
+        if level == "error":
+            return True, {"rule": rule.path, "rate": 1.0, "reason": "error"}
+        if duration_ms >= self.slow_request_ms:
+            return True, {"rule": rule.path, "rate": 1.0, "reason": "slow"}
+        if level not in levels or rule.rate >= 1.0:
+            return True, None
+        if self._rand() < rule.rate:
+            return True, {"rule": rule.path, "rate": rule.rate, "reason": "sampled"}
+        return False, None
+
+
+http_sampler = HttpSampler(log_settings.LOG_SAMPLING_RULES, log_settings.LOG_SLOW_REQUEST_MS)
@@ -1,9 +1,11 @@
-import copy
+from itertools import islice
 from typing import Any
 
 from app.core.logging.log_settings import log_settings
 
 REDACTED = "***REDACTED***"
+MAX_DEPTH_MARKER = "...[MAX_DEPTH]"
+TRUNCATED_ITEMS_KEY = "..."
 
 ALWAYS_SENSITIVE = {
     "password", "senha", "token", "access_token", "refresh_token",
@@ -12,35 +14,120 @@ ALWAYS_SENSITIVE = {
 }
 
 
-def _get_sensitive_fields() -> set[str]:
+def _get_sensitive_fields() -> frozenset[str]:
     """Build the complete set of sensitive field names from config + defaults."""
     configured = set(
         f.strip().lower()
         for f in log_settings.LOG_SENSITIVE_FIELDS.split(",")
         if f.strip()
     )
-    return ALWAYS_SENSITIVE | configured
+    return frozenset(ALWAYS_SENSITIVE | configured)
 
 
-def sanitize(data: Any, _sensitive: set[str] | None = None) -> Any:
-    """Recursively sanitize a data structure, masking sensitive fields and truncating long strings."""
+# Compiled once, not per call
+_SENSITIVE = _get_sensitive_fields()
+
+# Metadata keys repeat a lot; remembering the harmless ones skips lower()
+_SAFE_KEYS: set[str] = set()
+_SAFE_KEYS_MAX = 4096
+
+
+def _is_sensitive(key: str) -> bool:
+    if key.lower() in _SENSITIVE:
+        return True
+    if len(_SAFE_KEYS) >= _SAFE_KEYS_MAX:
+        _SAFE_KEYS.clear()
+    _SAFE_KEYS.add(key)
+    return False
+
+
+# Values that can never need redaction or truncation
+_LEAVES = frozenset({int, float, bool, type(None)})
+
+
+def _truncated_items(count: int) -> str:
+    return f"...[{count} ITEMS TRUNCATED]"
+
+
+def sanitize(data: Any, _sensitive: set[str] | frozenset[str] | None = None) -> Any:
+    """
+    Mask sensitive fields, truncate long strings and cap nesting and size.
+
+    Containers that need no change are returned as-is rather than copied;
+    callers must treat the result as read-only.
+    """
     if _sensitive is None:
-        _sensitive = _get_sensitive_fields()
+        safe_keys, is_sensitive = _SAFE_KEYS, _is_sensitive
+    else:
+        safe_keys = frozenset()
+
+        def is_sensitive(key: str) -> bool:
+            return key.lower() in _sensitive
+
+    max_length = log_settings.LOG_MAX_FIELD_LENGTH
+    max_depth = log_settings.LOG_SANITIZE_MAX_DEPTH
+    # Shared by every level, so the whole payload costs at most this many visits
+    budget = log_settings.LOG_SANITIZE_MAX_ITEMS
 
-    if isinstance(data, dict):
-        sanitized = {}
+    def visit(value: Any, depth: int) -> Any:
+        """Return `value` itself when nothing inside it has to change."""
+        cls = value.__class__
+        if cls is str:
+            if len(value) > max_length:
+                return value[:max_length] + "...[TRUNCATED]"
+            return value
+        if cls is dict or isinstance(value, dict):
+            return MAX_DEPTH_MARKER if depth >= max_depth else visit_dict(value, depth + 1)
+        if cls is list or isinstance(value, list):
+            return MAX_DEPTH_MARKER if depth >= max_depth else visit_list(value, depth + 1)
+        # Return primitives as-is
+        return value
+
+    def visit_dict(data: dict, depth: int) -> dict:
+        nonlocal budget
+        copy = None  # created on the first change only
+        index = 0
         for key, value in data.items():
-            if key.lower() in _sensitive:
-                sanitized[key] = REDACTED
+            if budget <= 0:
+                if copy is None:
+                    copy = dict(islice(data.items(), index))
+                copy[TRUNCATED_ITEMS_KEY] = _truncated_items(len(data) - index)
+                return copy
+            budget -= 1
+            if key.__class__ is str and key not in safe_keys and is_sensitive(key):
+                new = REDACTED
             else:
-                sanitized[key] = sanitize(value, _sensitive)
-        return sanitized
-
-    if isinstance(data, list):
-        return [sanitize(item, _sensitive) for item in data]
+                cls = value.__class__
+                if cls in _LEAVES or (cls is str and len(value) <= max_length):
+                    new = value
+                else:
+                    new = visit(value, depth)
+            if new is not value and copy is None:
+                copy = dict(islice(data.items(), index))
+            if copy is not None:
+                copy[key] = new
+            index += 1
+        return data if copy is None else copy
 
-    if isinstance(data, str) and len(data) > log_settings.LOG_MAX_FIELD_LENGTH:
-        return data[: log_settings.LOG_MAX_FIELD_LENGTH] + "...[TRUNCATED]"
+    def visit_list(data: list, depth: int) -> list:
+        nonlocal budget
+        copy = None
+        for index, item in enumerate(data):
+            if budget <= 0:
+                if copy is None:
+                    copy = data[:index]
+                copy.append(_truncated_items(len(data) - index))
+                return copy
+            budget -= 1
+            cls = item.__class__
+            if cls in _LEAVES or (cls is str and len(item) <= max_length):
+                new = item
+            else:
+                new = visit(item, depth)
+            if new is not item and copy is None:
+                copy = data[:index]
+            if copy is not None:
+                copy.append(new)
+        return data if copy is None else copy
 
-    # Return primitives as-is
-    return data
+    return visit(data, 0)
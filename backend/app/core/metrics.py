@@ -0,0 +1,57 @@
+"""Prometheus metrics for HTTP traffic, served at /metrics.
+
+LogMiddleware feeds every request into a counter and a latency histogram
+labelled by method, route template (`/api/v1/professionals/{professional_id}`,
+never the raw path) and status class.
+
+Each worker process keeps its own values. When PROMETHEUS_MULTIPROC_DIR is
+set (before the app is imported), workers write their samples to files in
+that directory and /metrics sums them across all workers, so a scrape sees
+the whole server whichever worker answers it. The available-slots cache
+reports its hits and misses here too. The directory has to be
+emptied when the server starts; gunicorn.conf.py does that and cleans up
+after workers that exit.
+"""
+import os
+from typing import Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.multiprocess import MultiProcessCollector
+
+# Requests that matched no route share one label, so scanners probing
+# random paths cannot blow up the number of series
+UNMATCHED_ROUTE = "unmatched"
+
+LABELS = ("method", "route", "status")
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests handled.", LABELS,
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds.", LABELS,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+availability_cache_lookups_total = Counter(
+    "availability_cache_lookups_total", "Available-slots cache lookups.", ("result",),
+)
+
+
+def status_class(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+
+def observe_request(method: str, route: str, status_code: int, duration_seconds: float) -> None:
+    labels = (method, route, status_class(status_code))
+    http_requests_total.labels(*labels).inc()
+    http_request_duration_seconds.labels(*labels).observe(duration_seconds)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Metrics in the Prometheus text format, summed over workers in multiprocess mode."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,95 @@
+"""Per-request SQL statement count and database time.
+
+LogMiddleware starts a QueryStats for each request in a contextvar; engine
+event hooks add every statement to it. The contextvar reaches sync
+endpoints (copied into the threadpool) and the async engine's greenlets,
+and both see the same QueryStats object, so the middleware reads the totals
+for the whole request once the response is sent. Counters nest: a
+`query_stats_scope` opened around requests (tests, benchmarks) also gets
+the statements each request counts.
+
+Statements slower than LOG_SLOW_QUERY_MS are also logged on their own.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.logging.log_dependency import get_log_service
+from app.core.logging.log_settings import log_settings
+
+
+class QueryStats:
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.count = 0
+        self.duration_ms = 0.0
+        self._parent = parent
+        # A request's dependencies and endpoint may run on different threads
+        self._lock = threading.Lock()
+
+    def add(self, duration_ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.duration_ms += duration_ms
+        if self._parent is not None:
+            self._parent.add(duration_ms)
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_query_stats() -> QueryStats:
+    """Start counting for the current request (or task) and return the counter."""
+    stats = QueryStats(parent=_current.get())
+    _current.set(stats)
+    return stats
+
+
+@contextmanager
+def query_stats_scope() -> Iterator[QueryStats]:
+    """Count the statements run inside the block, including those of requests it makes."""
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    duration_ms = (time.perf_counter() - conn.info["query_started"].pop()) * 1000
+    stats = _current.get()
+    if stats is not None:
+        stats.add(duration_ms)
+    threshold = log_settings.LOG_SLOW_QUERY_MS
+    if threshold and duration_ms >= threshold:
+        # Parameters are left out: they carry user data
+        get_log_service().log_nowait(
+            "warn",
+            action="SLOW_QUERY",
+            message=f"SQL statement took {duration_ms:.0f}ms",
+            category="system",
+            metadata={"statement": statement, "duration_ms": round(duration_ms, 2)},
+        )
+
+
+def _handle_error(context) -> None:
+    # A failed statement never reaches after_cursor_execute
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements run through `engine` (pass `.sync_engine` for an AsyncEngine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
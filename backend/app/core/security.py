@@ -1,8 +1,38 @@
+import asyncio
+import hashlib
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
+from app.core.config import settings
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt costs 100-250 ms of CPU per call. Async endpoints run it here rather
+# than on the event loop, and the small fixed pool caps how many cores a
+# burst of logins can take from the rest of the worker.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+
+# Accounts created without a password (guest bookings) store this prefix
+# plus random characters instead of a hash. No bcrypt hash starts with it,
+# so no password ever matches until the account is claimed.
+UNUSABLE_PASSWORD_PREFIX = "!"
+
+
+def make_unusable_password() -> str:
+    return UNUSABLE_PASSWORD_PREFIX + secrets.token_urlsafe(16)
+
+
+def has_usable_password(hashed_password: str) -> bool:
+    return not hashed_password.startswith(UNUSABLE_PASSWORD_PREFIX)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
+    if not has_usable_password(hashed_password):
+        return False
     return pwd_context.verify(plain_password, hashed_password)
 
 
@@ -10,10 +40,21 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    if not has_usable_password(hashed_password):
+        return False
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, get_password_hash, password)
+
+
 from datetime import datetime, timedelta
-from typing import Any, Union
-from jose import jwt
-from app.core.config import settings
+from typing import Any, Optional, Tuple, Union
+from jose import jwt, JWTError
 
 def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
     if expires_delta:
@@ -23,3 +64,45 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
     to_encode = {"exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
+
+
+CLAIM_ACCOUNT_PURPOSE = "claim_account"
+
+
+def _password_fingerprint(hashed_password: str) -> str:
+    return hashlib.sha256(hashed_password.encode()).hexdigest()[:16]
+
+
+def create_claim_account_token(user_id: Any, unusable_password: str) -> str:
+    """
+    Token that lets a guest set their first password.
+
+    It carries a fingerprint of the account's current unusable password, so
+    it stops working once any password has been set.
+    """
+    expire = datetime.utcnow() + timedelta(minutes=settings.CLAIM_ACCOUNT_TOKEN_EXPIRE_MINUTES)
+    to_encode = {
+        "exp": expire,
+        "sub": str(user_id),
+        "purpose": CLAIM_ACCOUNT_PURPOSE,
+        "pwd": _password_fingerprint(unusable_password),
+    }
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_claim_account_token(token: str) -> Optional[Tuple[str, str]]:
+    """(user id, password fingerprint) of a valid, unexpired claim token, or None."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("purpose") != CLAIM_ACCOUNT_PURPOSE or not payload.get("sub") or not payload.get("pwd"):
+        return None
+    return payload["sub"], payload["pwd"]
+
+
+def claim_account_token_matches(fingerprint: str, hashed_password: str) -> bool:
+    """Whether a claim token was issued for the account's current, still unusable, password."""
+    if has_usable_password(hashed_password):
+        return False
+    return secrets.compare_digest(fingerprint, _password_fingerprint(hashed_password))
@@ -36,7 +36,6 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj = self.model(**obj_in_data)  # type: ignore
         db.add(db_obj)
         db.commit()
-        db.refresh(db_obj)
         return db_obj
 
     def update(
@@ -56,7 +55,6 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 setattr(db_obj, field, update_data[field])
         db.add(db_obj)
         db.commit()
-        db.refresh(db_obj)
         return db_obj
 
     def remove(self, db: Session, *, id: Any) -> ModelType:
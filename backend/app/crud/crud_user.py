@@ -1,17 +1,24 @@
 from typing import Any, Dict, Optional, Union
 
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, make_unusable_password, verify_password, verify_password_async
 from app.crud.base import CRUDBase
-from app.models.user import User
+from app.models.user import User, UserType
 from app.schemas.user import UserCreate, UserUpdate
+from app.services import user_cache
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
         return db.query(User).filter(User.email == email).first()
 
+    async def get_by_email_async(self, db: AsyncSession, *, email: str) -> Optional[User]:
+        return (await db.execute(select(User).filter(User.email == email))).scalars().first()
+
     def create(self, db: Session, *, obj_in: UserCreate) -> User:
         db_obj = User(
             email=obj_in.email,
@@ -23,9 +30,33 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         )
         db.add(db_obj)
         db.commit()
-        db.refresh(db_obj)
         return db_obj
 
+    def get_or_create_guest(
+        self, db: Session, *, email: str, name: str, phone: Optional[str]
+    ) -> User:
+        """
+        The user with `email`, created as a guest without a usable password if missing.
+
+        INSERT ... ON CONFLICT DO NOTHING, so two concurrent bookings with the
+        same new email get the same user instead of one failing on the unique
+        constraint. An existing account is left untouched (no row lock, no
+        dead tuple) and read back with one SELECT. Does not commit.
+        """
+        stmt = insert(User).values(
+            email=email,
+            name=name,
+            phone=phone,
+            password=make_unusable_password(),
+            type=UserType.CLIENT,
+            active=True,
+        ).on_conflict_do_nothing(index_elements=[User.email]).returning(User)
+        guest = db.scalars(stmt).one_or_none()
+        if guest is None:
+            # RETURNING is empty on conflict; the row it hit is committed, so it is visible now
+            guest = db.scalars(select(User).filter(User.email == email)).one()
+        return guest
+
     def update(
         self,
         db: Session,
@@ -41,7 +72,14 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             hashed_password = get_password_hash(update_data["password"])
             del update_data["password"]
             update_data["password"] = hashed_password
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        db_obj = super().update(db, db_obj=db_obj, obj_in=update_data)
+        user_cache.invalidate(db_obj.id)
+        return db_obj
+
+    def remove(self, db: Session, *, id: Any) -> User:
+        obj = super().remove(db, id=id)
+        user_cache.invalidate(obj.id)
+        return obj
 
     def authenticate(
         self, db: Session, *, email: str, password: str
@@ -53,5 +91,16 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             return None
         return user
 
+    async def authenticate_async(
+        self, db: AsyncSession, *, email: str, password: str
+    ) -> Optional[User]:
+        """Like `authenticate`, without blocking the event loop on the query or on bcrypt."""
+        user = await self.get_by_email_async(db, email=email)
+        if not user:
+            return None
+        if not await verify_password_async(password, user.password):
+            return None
+        return user
+
 
 user = CRUDUser(User)
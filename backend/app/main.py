@@ -1,46 +1,66 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import text
 
 from app.core.config import settings
 from app.api.v1.api import api_router
-from app.core.database import engine, Base
+from app.core.database import engine, async_engine, Base
 from app.core.logging.log_context import get_trace_id
 from app.core.logging.log_middleware import LogMiddleware
 from app.core.logging.log_dependency import get_log_service
 from app.core.logging.log_repository import create_log_indexes, close_mongo_client
+from app.core.logging.log_writer import log_writer
 from app.core.logging.log_schema import ErrorDetail
+from app.core.metrics import render_metrics
 
 # Import all models to ensure they are registered with Base
-from app.models import user, professional, service, appointment, working_hours, block, review
+from app.models import user, professional, service, appointment, working_hours, block, review, availability_bitmap
 
 logger = logging.getLogger(__name__)
 
 
+# Key of the Postgres advisory lock held while one worker creates the schema
+# and default data; the other workers wait for it, then find the work done
+STARTUP_LOCK_KEY = 7_201_842
+
+
+def initialize_database() -> None:
+    """Create tables and default data, one worker process at a time."""
+    with engine.connect() as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": STARTUP_LOCK_KEY})
+        try:
+            Base.metadata.create_all(bind=connection)
+            connection.commit()
+            try:
+                from populate_db import populate
+                populate()
+                logger.info("Database populated with default data successfully.")
+            except Exception as e:
+                logger.error(f"Error during database population on startup: {e}")
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": STARTUP_LOCK_KEY})
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup/shutdown lifecycle manager."""
     # Startup
-    Base.metadata.create_all(bind=engine)
+    await asyncio.to_thread(initialize_database)
     await create_log_indexes()
-    
-    # Run the initial database population synchronously in a thread
-    try:
-        from populate_db import populate
-        import asyncio
-        await asyncio.to_thread(populate)
-        logger.info("Database populated with default data successfully.")
-    except Exception as e:
-        logger.error(f"Error during database population on startup: {e}")
+    log_writer.start()
 
     logger.info("Application started — MongoDB indexes ensured.")
     yield
-    # Shutdown
+    # Shutdown — drain buffered logs before the Mongo client goes away
+    await log_writer.stop()
     await close_mongo_client()
+    await async_engine.dispose()
     logger.info("Application shutdown — MongoDB connection closed.")
 
 
@@ -155,3 +175,9 @@ def read_root():
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -5,3 +5,4 @@ from .user import User
 from .block import Block
 from .review import Review
 from .working_hours import WorkingHours
+from .availability_bitmap import AvailabilityBitmap
@@ -1,13 +1,29 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Enum, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
 from app.core.enums.appointment_status import AppointmentStatus
 
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, ExcludeConstraint
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        # No two active appointments of a professional may overlap. The
+        # professional_id is wrapped in a single-value range so the GiST index
+        # only needs the built-in range operator classes (no btree_gist).
+        ExcludeConstraint(
+            (text("int4range(professional_id, professional_id, '[]')"), "&&"),
+            (text("tsrange(date_time, date_time + duration * interval '1 minute')"), "&&"),
+            name="appointments_no_overlap",
+            using="gist",
+            where=text("status <> 'CANCELLED'"),
+        ),
+        # Availability lookups and the professional's agenda
+        Index("ix_appointments_professional_id_date_time_status", "professional_id", "date_time", "status"),
+        # Client's agenda
+        Index("ix_appointments_client_id_date_time", "client_id", "date_time"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     professional_id = Column(Integer, ForeignKey("professionals.id"))
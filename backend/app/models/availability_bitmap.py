@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, DateTime, LargeBinary
+from datetime import datetime
+from app.core.database import Base
+
+class AvailabilityBitmap(Base):
+    """Busy map of one professional's day, one bit per minute (bit set = busy)."""
+    __tablename__ = "availability_bitmaps"
+
+    professional_id = Column(Integer, ForeignKey("professionals.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    busy = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
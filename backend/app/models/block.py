@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from datetime import datetime
 
 class Block(Base):
     __tablename__ = "blocks"
+    __table_args__ = (
+        Index("ix_blocks_professional_id_start_time_end_time", "professional_id", "start_time", "end_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     professional_id = Column(Integer, ForeignKey("professionals.id"), nullable=False)
@@ -7,7 +7,7 @@ class Service(Base):
     __tablename__ = "services"
     
     id = Column(Integer, primary_key=True, index=True)
-    professional_id = Column(Integer, ForeignKey("professionals.id"))
+    professional_id = Column(Integer, ForeignKey("professionals.id"), index=True)
     name = Column(String, nullable=False)
     description = Column(Text)
     duration = Column(Integer, nullable=False)  # em minutos
@@ -1,9 +1,16 @@
-from sqlalchemy import Column, Integer, ForeignKey, Time, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, Time, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class WorkingHours(Base):
     __tablename__ = "working_hours"
+    __table_args__ = (
+        Index(
+            "ix_working_hours_professional_id_day_of_week_active",
+            "professional_id", "day_of_week",
+            postgresql_where=text("active"),
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     professional_id = Column(Integer, ForeignKey("professionals.id"))
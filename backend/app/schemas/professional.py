@@ -37,6 +37,17 @@ class Professional(ProfessionalInDBBase):
     user: Optional[User] = None
     services: List[Service] = []
 
+# Directory listing: one row per professional, no nested user or services
+class ProfessionalSummary(BaseModel):
+    id: int
+    user_id: UUID
+    name: str
+    speciality: Optional[str] = None
+    photo_url: Optional[str] = None
+    address: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
 # Additional properties stored in DB
 class ProfessionalInDB(ProfessionalInDBBase):
     pass
@@ -7,3 +7,5 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     sub: Optional[str] = None
+    # Set on single-purpose tokens (e.g. claim_account), which never authenticate requests
+    purpose: Optional[str] = None
@@ -22,6 +22,14 @@ class UserUpdate(BaseModel):
     phone: Optional[str] = None
     password: Optional[str] = None
 
+# Guest accounts: ask for a link to set the first password, then set it
+class ClaimAccountRequest(BaseModel):
+    email: EmailStr
+
+class ClaimAccount(BaseModel):
+    token: str
+    password: str
+
 # Properties shared by models stored in DB
 class UserInDBBase(UserBase):
     id: UUID
@@ -0,0 +1,84 @@
+"""Availability engine: turns a day's busy intervals into bookable slots.
+
+Pure functions with no database or FastAPI dependency, so they can be
+unit-tested and benchmarked in isolation.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Sequence, Tuple
+
+Interval = Tuple[datetime, datetime]
+
+
+def coalesce_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort busy intervals and merge the ones that overlap or touch."""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_slots(
+    window_start: datetime,
+    window_end: datetime,
+    duration: timedelta,
+    busy: Sequence[Interval],
+) -> List[datetime]:
+    """
+    Return the start of every free slot in a single sweep.
+
+    Candidate slots are laid on a grid of `duration` starting at
+    `window_start`. `busy` must be sorted and coalesced (see
+    `coalesce_intervals`), which lets the sweep skip every grid point
+    covered by a busy interval instead of testing them one by one.
+    """
+    if duration <= timedelta(0):
+        raise ValueError("duration must be positive")
+
+    slots: List[datetime] = []
+    i, n = 0, len(busy)
+    current = window_start
+
+    while current + duration <= window_end:
+        # Intervals ending before this slot can't touch any later slot either
+        while i < n and busy[i][1] <= current:
+            i += 1
+
+        if i == n or busy[i][0] >= current + duration:
+            slots.append(current)
+            current += duration
+        else:
+            # Jump to the first grid point at or after the end of the conflict
+            steps = -(-(busy[i][1] - current) // duration)
+            current += duration * steps
+
+    return slots
+
+
+def day_slots(
+    day: date,
+    work_start: time,
+    work_end: time,
+    duration_minutes: int,
+    busy: Iterable[Interval],
+) -> List[str]:
+    """Free slots ("HH:MM") of `duration_minutes` within a day's working hours."""
+    slots = free_slots(
+        datetime.combine(day, work_start),
+        datetime.combine(day, work_end),
+        timedelta(minutes=duration_minutes),
+        coalesce_intervals(busy),
+    )
+    return [slot.strftime("%H:%M") for slot in slots]
+
+
+def upcoming_slots(day: date, slots: List[str], now: datetime) -> List[str]:
+    """The `slots` of `day` that have not started by `now`."""
+    if day > now.date():
+        return slots
+    if day < now.date():
+        return []
+    return [slot for slot in slots if datetime.combine(day, time.fromisoformat(slot)) >= now]
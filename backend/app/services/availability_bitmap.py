@@ -0,0 +1,155 @@
+"""Materialized per-day busy bitmaps: a cache of the sweep's input.
+
+A day's appointments and blocks are stored as one integer bitmap per
+(professional, date), with a bit set for every minute they touch. Reading a
+stored day is one primary-key lookup instead of the appointments and blocks
+queries; `busy_intervals` turns the bits back into minute intervals and the
+slots still come from `availability.day_slots`, the only slot engine. Slots
+start on whole minutes, so rounding busy time out to whole minutes never
+changes the answer.
+
+Bitmaps depend on appointments and blocks only; working hours are applied
+by the sweep, so changing them never requires a rebuild. Rows are stored
+only for today through AVAILABILITY_BITMAP_HORIZON_DAYS ahead, and only by
+the write transaction of a booking, cancellation or block change that
+touches their day. Reads never write: a day without a stored row, or outside
+the horizon, is read from the source rows. Rows for past days are pruned
+whenever the professional's bitmaps are refreshed.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.availability_bitmap import AvailabilityBitmap
+from app.services.availability import Interval
+from app.services.availability_loader import date_range, load_busy_by_day
+
+_BITMAP_BYTES = (24 * 60 + 7) // 8
+
+
+def _minutes_since(day_start: datetime, moment: datetime) -> int:
+    return (moment - day_start) // timedelta(minutes=1)
+
+
+def build_bitmap(day: date, busy: Iterable[Interval]) -> int:
+    """Set a bit for every minute of `day` that overlaps a busy interval."""
+    day_start = datetime.combine(day, time.min)
+    day_end = day_start + timedelta(days=1)
+    bits = 0
+    for start, end in busy:
+        start, end = max(start, day_start), min(end, day_end)
+        if start >= end:
+            continue
+        first = _minutes_since(day_start, start)
+        last = -(-(end - day_start) // timedelta(minutes=1))
+        bits |= ((1 << (last - first)) - 1) << first
+    return bits
+
+
+def busy_intervals(day: date, bits: int) -> List[Interval]:
+    """The runs of set bits as sorted, coalesced busy intervals."""
+    day_start = datetime.combine(day, time.min)
+    intervals = []
+    offset = 0
+    while bits:
+        skip = (bits & -bits).bit_length() - 1
+        bits >>= skip
+        length = (~bits & (bits + 1)).bit_length() - 1
+        bits >>= length
+        start = offset + skip
+        offset = start + length
+        intervals.append((day_start + timedelta(minutes=start), day_start + timedelta(minutes=offset)))
+    return intervals
+
+
+def to_bytes(bits: int) -> bytes:
+    return bits.to_bytes(_BITMAP_BYTES, "little")
+
+
+def from_bytes(data: bytes) -> int:
+    return int.from_bytes(data, "little")
+
+
+def in_horizon(day: date) -> bool:
+    """Whether `day` falls in the window that has stored bitmaps."""
+    today = date.today()
+    return today <= day <= today + timedelta(days=settings.AVAILABILITY_BITMAP_HORIZON_DAYS)
+
+
+def get_stored_bitmap(db: Session, professional_id: int, day: date) -> Optional[int]:
+    """A day's stored bitmap, or None when it has none or lies outside the horizon."""
+    if not in_horizon(day):
+        return None
+    row = db.get(AvailabilityBitmap, (professional_id, day))
+    return from_bytes(row.busy) if row is not None else None
+
+
+def load_day_busy(db: Session, professional_id: int, day: date) -> List[Interval]:
+    """A day's busy intervals, from its stored bitmap when there is one. Never writes."""
+    bits = get_stored_bitmap(db, professional_id, day)
+    if bits is not None:
+        return busy_intervals(day, bits)
+    busy = load_busy_by_day(db, [professional_id], day, day)
+    return busy.get((professional_id, day), [])
+
+
+def refresh_days(db: Session, professional_id: int, days: Iterable[date]) -> None:
+    """
+    Rebuild a professional's bitmaps for `days` inside the caller's transaction.
+
+    Call after flushing the change and before committing. The rows are
+    locked first, so concurrent writers on the same day serialize and each
+    rebuild reads the appointments and blocks committed before it. Days
+    outside the horizon are skipped; readers never trust a row there.
+    """
+    days = sorted(day for day in set(days) if in_horizon(day))
+    if not days:
+        return
+
+    now = datetime.utcnow()
+    # Drop the professional's past rows in the same round trip
+    pruned = delete(AvailabilityBitmap).where(
+        AvailabilityBitmap.professional_id == professional_id,
+        AvailabilityBitmap.date < date.today(),
+    ).cte("pruned")
+    db.execute(
+        insert(AvailabilityBitmap)
+        .values([
+            {"professional_id": professional_id, "date": day, "busy": to_bytes(0), "updated_at": now}
+            for day in days
+        ])
+        .on_conflict_do_nothing()
+        .add_cte(pruned)
+    )
+    rows = db.query(AvailabilityBitmap).filter(
+        AvailabilityBitmap.professional_id == professional_id,
+        AvailabilityBitmap.date.in_(days),
+    ).order_by(AvailabilityBitmap.date).with_for_update().populate_existing().all()
+
+    busy = {}
+    for first_day, last_day in _contiguous_runs(days):
+        busy.update(load_busy_by_day(db, [professional_id], first_day, last_day))
+    for row in rows:
+        row.busy = to_bytes(build_bitmap(row.date, busy.get((professional_id, row.date), [])))
+        row.updated_at = now
+    db.flush()
+
+
+def _contiguous_runs(days: List[date]) -> List[tuple]:
+    """Group sorted dates into (first, last) runs of consecutive days."""
+    runs = []
+    for day in days:
+        if runs and (day - runs[-1][1]).days == 1:
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+
+def days_spanned(start: datetime, end: datetime) -> List[date]:
+    """Every date touched by [start, end]."""
+    return list(date_range(start.date(), end.date()))
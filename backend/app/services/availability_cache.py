@@ -0,0 +1,53 @@
+"""Cache of computed available-slots answers, invalidated by the write paths.
+
+Entries are keyed by (professional_id, date, service_id). Each worker
+process holds its own cache, so the TTL bounds how long another worker can
+serve an answer made stale by a write it did not see.
+"""
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import availability_cache_lookups_total
+
+_cache = LRUCache(
+    max_size=settings.AVAILABILITY_CACHE_MAX_SIZE,
+    ttl_seconds=settings.AVAILABILITY_CACHE_TTL_SECONDS,
+)
+
+
+def generation() -> int:
+    """Take before computing slots and hand to `store_slots`."""
+    return _cache.generation
+
+
+def get_slots(professional_id: int, day: date, service_id: int) -> Optional[List[str]]:
+    slots = _cache.get((professional_id, day, service_id))
+    availability_cache_lookups_total.labels("miss" if slots is None else "hit").inc()
+    return slots
+
+
+def store_slots(
+    professional_id: int, day: date, service_id: int, slots: List[str], generation: int
+) -> None:
+    _cache.set((professional_id, day, service_id), slots, generation=generation)
+
+
+def invalidate(professional_id: int, days: Optional[Iterable[date]] = None) -> int:
+    """Drop a professional's cached answers, for the given days or all of them."""
+    if days is None:
+        return _cache.invalidate(lambda key: key[0] == professional_id)
+    day_set = set(days)
+    return _cache.invalidate(lambda key: key[0] == professional_id and key[1] in day_set)
+
+
+def invalidate_span(professional_id: int, start: datetime, end: datetime) -> int:
+    """Drop a professional's cached answers for every day touched by [start, end]."""
+    first_day, last_day = start.date(), end.date()
+    days = (first_day + timedelta(days=n) for n in range((last_day - first_day).days + 1))
+    return invalidate(professional_id, days)
+
+
+def clear() -> None:
+    _cache.clear()
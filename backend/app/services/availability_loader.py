@@ -0,0 +1,90 @@
+"""Set-based loading of the rows the availability engine works on.
+
+Each loader issues one query per table for a whole date window and any
+number of professionals, and buckets the rows in memory so callers can
+compute many days without going back to the database.
+"""
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.enums.appointment_status import AppointmentStatus
+from app.models.appointment import Appointment
+from app.models.block import Block
+from app.models.working_hours import WorkingHours
+from app.services.availability import Interval
+
+WorkingHoursMap = Dict[Tuple[int, int], Tuple[time, time]]
+BusyMap = Dict[Tuple[int, date], List[Interval]]
+
+
+def date_range(start_date: date, end_date: date) -> Iterator[date]:
+    """Yield every date from start_date to end_date, inclusive."""
+    for offset in range((end_date - start_date).days + 1):
+        yield start_date + timedelta(days=offset)
+
+
+def load_working_hours(db: Session, professional_ids: Sequence[int]) -> WorkingHoursMap:
+    """Active working hours keyed by (professional_id, day_of_week)."""
+    rows = db.query(
+        WorkingHours.professional_id,
+        WorkingHours.day_of_week,
+        WorkingHours.start_time,
+        WorkingHours.end_time,
+    ).filter(
+        WorkingHours.professional_id.in_(professional_ids),
+        WorkingHours.active == True
+    ).order_by(WorkingHours.id).all()
+
+    hours: WorkingHoursMap = {}
+    for row in rows:
+        # Keep the first row per weekday, like the single-day lookup always did
+        hours.setdefault((row.professional_id, row.day_of_week), (row.start_time, row.end_time))
+    return hours
+
+
+def load_busy_by_day(
+    db: Session,
+    professional_ids: Sequence[int],
+    start_date: date,
+    end_date: date,
+) -> BusyMap:
+    """
+    Busy intervals keyed by (professional_id, date) for the whole window.
+
+    Appointments count on the day they start; blocks count on every day
+    of the window they overlap.
+    """
+    window_start = datetime.combine(start_date, time.min)
+    window_end = datetime.combine(end_date + timedelta(days=1), time.min)
+    busy: BusyMap = defaultdict(list)
+
+    appointments = db.query(
+        Appointment.professional_id, Appointment.date_time, Appointment.duration
+    ).filter(
+        Appointment.professional_id.in_(professional_ids),
+        Appointment.date_time >= window_start,
+        Appointment.date_time < window_end,
+        Appointment.status != AppointmentStatus.CANCELLED,
+    ).all()
+
+    for appt in appointments:
+        busy[(appt.professional_id, appt.date_time.date())].append(
+            (appt.date_time, appt.date_time + timedelta(minutes=appt.duration))
+        )
+
+    blocks = db.query(Block.professional_id, Block.start_time, Block.end_time).filter(
+        Block.professional_id.in_(professional_ids),
+        Block.start_time < window_end,
+        Block.end_time > window_start,
+    ).all()
+
+    for block in blocks:
+        first_day = max(block.start_time.date(), start_date)
+        last_day = min(block.end_time.date(), end_date)
+        for day in date_range(first_day, last_day):
+            busy[(block.professional_id, day)].append((block.start_time, block.end_time))
+
+    return busy
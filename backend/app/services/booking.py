@@ -0,0 +1,77 @@
+"""Helpers shared by the endpoints that write appointments."""
+from typing import Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.appointment import Appointment
+from app.models.professional import Professional
+from app.models.service import Service
+from app.models.user import User
+
+# SQLSTATE raised by Postgres when an EXCLUDE constraint rejects a row
+EXCLUSION_VIOLATION = "23P01"
+OVERLAP_CONSTRAINT = "appointments_no_overlap"
+
+
+def is_overlap_violation(exc: IntegrityError) -> bool:
+    """True when `exc` comes from the appointments non-overlap constraint."""
+    orig = exc.orig
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    return code == EXCLUSION_VIOLATION and OVERLAP_CONSTRAINT in str(orig)
+
+
+def load_professional_and_service(
+    db: Session, professional_id: int, service_id: int
+) -> Tuple[Professional, Service]:
+    """
+    The professional (with their user) and the service of a booking, in one query.
+
+    Raises 404 when either does not exist.
+    """
+    row = db.execute(
+        select(Professional, Service)
+        .outerjoin(Service, Service.id == service_id)
+        .options(joinedload(Professional.user))
+        .where(Professional.id == professional_id)
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Professional not found")
+    professional, service = row
+    if service is None:
+        raise HTTPException(status_code=404, detail="Service not found")
+    return professional, service
+
+
+def link_loaded(appointment: Appointment, professional: Professional, service: Service, client: User) -> None:
+    """
+    Point a new appointment's relationships at rows the endpoint already loaded.
+
+    A freshly flushed appointment has only its foreign keys set, and with
+    expire_on_commit=False (core/database.py) nothing refreshes it after
+    commit, so serializing the response would lazy-load each relationship.
+    set_committed_value fills them in as loaded state without marking the
+    appointment dirty, so those loads never happen.
+    """
+    set_committed_value(appointment, "professional", professional)
+    set_committed_value(appointment, "service", service)
+    set_committed_value(appointment, "client", client)
+
+
+def flush_appointment(db: Session) -> None:
+    """
+    Flush pending appointment writes, turning a slot conflict into a 409.
+
+    The database rejects the second of two concurrent bookings for the same
+    time, so this is the only check needed; nothing is serialized up front.
+    """
+    try:
+        db.flush()
+    except IntegrityError as e:
+        db.rollback()
+        if is_overlap_violation(e):
+            raise HTTPException(status_code=409, detail="This time slot is no longer available")
+        raise
@@ -1,6 +1,7 @@
 import logging
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 from jinja2 import Environment, FileSystemLoader
 
@@ -34,8 +35,13 @@ async def send_appointment_confirmation(
     service_name: str,
     professional_name: str,
     duration: int,
+    claim_url: Optional[str] = None,
 ) -> None:
-    """Send appointment confirmation email (designed to run in BackgroundTasks)."""
+    """
+    Send appointment confirmation email (designed to run in BackgroundTasks).
+
+    Guests without a password also get `claim_url`, a link to set one.
+    """
     log_service = get_log_service()
     try:
         from app.core.config import settings
@@ -47,6 +53,7 @@ async def send_appointment_confirmation(
             professional_name=professional_name,
             duration=duration,
             frontend_url=settings.FRONTEND_URL,
+            claim_url=claim_url,
         )
         
         # Determine if email was actually sent or skipped
@@ -71,3 +78,38 @@ async def send_appointment_confirmation(
             error=e,
             category="integration"
         )
+
+
+def claim_account_url(token: str) -> str:
+    from app.core.config import settings
+    return f"{settings.FRONTEND_URL}/claim-account?token={token}"
+
+
+async def send_claim_account_email(client_name: str, client_email: str, claim_url: str) -> None:
+    """Send a guest the link to set their first password (designed to run in BackgroundTasks)."""
+    log_service = get_log_service()
+    try:
+        template = _jinja_env.get_template("claim_account.html")
+        html = template.render(client_name=client_name, claim_url=claim_url)
+
+        sent = await send_email(
+            to=client_email,
+            subject="Crie sua senha",
+            html_body=html,
+        )
+
+        if sent:
+            await log_service.info(
+                action="EMAIL_SENT",
+                message=f"Claim account link sent to {client_email}",
+                category="integration",
+                metadata={"to": client_email},
+            )
+
+    except Exception as e:
+        await log_service.error(
+            action="EMAIL_FAILED",
+            message=f"Failed to send claim account link to {client_email}",
+            error=e,
+            category="integration"
+        )
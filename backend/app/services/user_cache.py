@@ -0,0 +1,87 @@
+"""Cache of authenticated users, so get_current_user skips the database.
+
+Entries are keyed by user id and hold plain column values of an active user
+and of their professional profile, if any; the password hash is left out.
+A hit is rebuilt into ORM objects and merged into the request's session
+without a query, so `current_user.professional.id` costs nothing either.
+
+CRUDUser.update/remove and professional profile updates invalidate the
+entry. Each worker process holds its own cache, so the TTL bounds how long
+another worker can accept a user that was changed, deactivated or deleted
+through a write it did not see.
+"""
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models.professional import Professional
+from app.models.user import User
+
+_USER_COLUMNS = [attr.key for attr in inspect(User).column_attrs if attr.key != "password"]
+_PROFESSIONAL_COLUMNS = [attr.key for attr in inspect(Professional).column_attrs]
+
+_cache = LRUCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+def generation() -> int:
+    """Take before loading the user and hand to `store`."""
+    return _cache.generation
+
+
+def store(user: User, generation: int) -> None:
+    """Cache `user`, whose `professional` must already be loaded. Inactive users are not cached."""
+    if not user.active:
+        return
+    professional = user.professional
+    entry = (
+        {key: getattr(user, key) for key in _USER_COLUMNS},
+        {key: getattr(professional, key) for key in _PROFESSIONAL_COLUMNS} if professional else None,
+    )
+    _cache.set(user.id, entry, generation=generation)
+
+
+def _detached(user_id: UUID) -> Optional[User]:
+    entry = _cache.get(user_id)
+    if entry is None:
+        return None
+    user_values, professional_values = entry
+    user = User(**user_values)
+    make_transient_to_detached(user)
+    professional = None
+    if professional_values is not None:
+        professional = Professional(**professional_values)
+        make_transient_to_detached(professional)
+    set_committed_value(user, "professional", professional)
+    return user
+
+
+def get(db: Session, user_id: UUID) -> Optional[User]:
+    """The cached user merged into `db` (with their professional), or None."""
+    user = _detached(user_id)
+    return db.merge(user, load=False) if user is not None else None
+
+
+async def get_async(db: AsyncSession, user_id: UUID) -> Optional[User]:
+    user = _detached(user_id)
+    return await db.merge(user, load=False) if user is not None else None
+
+
+def invalidate(user_id: UUID) -> int:
+    return _cache.invalidate(lambda key: key == user_id)
+
+
+def stats() -> dict:
+    return _cache.stats()
+
+
+def clear() -> None:
+    _cache.clear()
@@ -0,0 +1,135 @@
+"""Read cost of available-slots with and without a stored busy bitmap, against
+the cost writes pay to keep the bitmaps fresh.
+
+Seeds one professional with a dense day (appointments every slot but a few,
+plus blocks) into DATABASE_URL, then measures:
+
+- a read with the day's bitmap stored: one primary-key lookup for the busy time;
+- a read without it: the appointments and blocks queries;
+- `refresh_days` for one day, the extra work every booking, cancellation
+  and block change does (rolled back).
+
+From these it prints how many reads one write has to be amortized over.
+Seeded rows are deleted at the end.
+
+    cd backend && python -m benchmarks.bench_available_slots [iterations]
+"""
+import logging
+import sys
+import time
+from datetime import date, datetime, timedelta
+from datetime import time as time_of_day
+from typing import Callable
+
+from sqlalchemy import delete, select
+
+from app.api.v1.endpoints.appointments import _compute_day_slots
+from app.core.database import SessionLocal
+from app.core.query_stats import query_stats_scope
+from app.models.appointment import Appointment
+from app.models.availability_bitmap import AvailabilityBitmap
+from app.models.block import Block
+from app.models.professional import Professional
+from app.models.service import Service
+from app.models.user import User, UserType
+from app.models.working_hours import WorkingHours
+from app.services import availability_bitmap
+
+EMAIL = "bench-slots@bench.example.com"
+REPEAT = 5
+
+
+def bench_day() -> date:
+    day = date.today() + timedelta(days=7)
+    return day + timedelta(days=-day.weekday() % 7)
+
+
+def seed(day: date) -> tuple:
+    with SessionLocal() as db:
+        user = User(email=EMAIL, password="!", name="Bench Slots", type=UserType.PROFESSIONAL, active=True)
+        professional = Professional(user=user, speciality="Bench Speciality")
+        service = Service(professional=professional, name="Bench Service", duration=15, price=100)
+        db.add_all([user, professional, service])
+        db.flush()
+        db.add_all([
+            WorkingHours(professional_id=professional.id, day_of_week=weekday,
+                         start_time=time_of_day(8), end_time=time_of_day(18), active=True)
+            for weekday in range(5)
+        ])
+        start = datetime.combine(day, time_of_day(8))
+        for n in range(40):
+            if n % 10 == 3:
+                continue
+            db.add(Appointment(professional_id=professional.id, client_id=user.id, service_id=service.id,
+                               date_time=start + timedelta(minutes=15 * n), duration=15))
+        db.add_all([
+            Block(professional_id=professional.id, start_time=start + timedelta(hours=h),
+                  end_time=start + timedelta(hours=h, minutes=40))
+            for h in (6, 8)
+        ])
+        db.commit()
+        return professional.id, service.id
+
+
+def cleanup() -> None:
+    with SessionLocal() as db:
+        user_id = db.scalar(select(User.id).where(User.email == EMAIL))
+        if user_id is None:
+            return
+        professional_id = db.scalar(select(Professional.id).where(Professional.user_id == user_id))
+        if professional_id is not None:
+            for model in (AvailabilityBitmap, Appointment, Block, WorkingHours, Service):
+                db.execute(delete(model).where(model.professional_id == professional_id))
+            db.execute(delete(Professional).where(Professional.id == professional_id))
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+
+
+def measure(action: Callable, iterations: int) -> tuple:
+    """Best mean time over REPEAT runs of `iterations` calls, and statements per call."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            action()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    with query_stats_scope() as stats:
+        action()
+    return best * 1000, stats.count
+
+
+def main(iterations: int) -> None:
+    logging.disable(logging.CRITICAL)
+    day = bench_day()
+    cleanup()
+    professional_id, service_id = seed(day)
+    try:
+        with SessionLocal() as db:
+            def read() -> None:
+                _compute_day_slots(db, professional_id, day, service_id)
+                db.rollback()  # drop the identity map, as a new request would
+
+            def refresh() -> None:
+                availability_bitmap.refresh_days(db, professional_id, [day])
+                db.rollback()
+
+            without_ms, without_statements = measure(read, iterations)
+            refresh_ms, refresh_statements = measure(refresh, iterations)
+            availability_bitmap.refresh_days(db, professional_id, [day])
+            db.commit()
+            with_ms, with_statements = measure(read, iterations)
+
+        print(f"{'read without bitmap':<24} {without_statements:>3} statements {without_ms:>7.3f} ms")
+        print(f"{'read with stored bitmap':<24} {with_statements:>3} statements {with_ms:>7.3f} ms")
+        print(f"{'refresh on write':<24} {refresh_statements:>3} statements {refresh_ms:>7.3f} ms")
+        saved = without_ms - with_ms
+        if saved > 0:
+            print(f"one write's refresh is repaid after {refresh_ms / saved:.1f} reads of the day")
+        else:
+            print("the stored bitmap does not make reads cheaper here")
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,98 @@
+"""Requests/sec of a trivial endpoint behind the logging middleware.
+
+Compares no middleware, the previous BaseHTTPMiddleware implementation and
+the current pure-ASGI LogMiddleware, all in-process over httpx's ASGI
+transport so only the middleware stack differs between runs.
+
+    cd backend && python -m benchmarks.bench_log_middleware [requests]
+"""
+import asyncio
+import logging
+import sys
+import time
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.logging.log_context import set_trace_id
+from app.core.logging.log_middleware import LogMiddleware
+from app.core.logging.log_schema import HttpContext
+from app.core.logging.log_service import LogService
+
+
+class BaseHTTPLogMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware version LogMiddleware replaced (success path)."""
+
+    def __init__(self, app, log_service: LogService):
+        super().__init__(app)
+        self.log_service = log_service
+
+    async def dispatch(self, request, call_next):
+        trace_id = request.headers.get("X-Trace-Id") or str(uuid4())
+        set_trace_id(trace_id)
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        http_ctx = HttpContext(
+            method=request.method,
+            path=str(request.url.path),
+            status_code=response.status_code,
+            duration_ms=round(duration_ms, 2),
+            user_agent=request.headers.get("user-agent"),
+            ip=request.client.host if request.client else None,
+        )
+        msg = f"{request.method} {request.url.path} {response.status_code} {duration_ms:.0f}ms"
+        await self.log_service.info(action="HTTP_REQUEST", message=msg, category="http", http=http_ctx)
+        response.headers["X-Trace-Id"] = trace_id
+        return response
+
+
+class DiscardingLogService(LogService):
+    """Builds every document as usual but never queues it."""
+
+    def _fire_and_forget(self, doc) -> None:
+        pass
+
+
+def build_app(middleware=None) -> FastAPI:
+    app = FastAPI()
+    if middleware is not None:
+        app.add_middleware(middleware, log_service=DiscardingLogService())
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    return app
+
+
+async def measure(app: FastAPI, requests: int, concurrency: int = 50) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/ping")  # warm-up
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                await client.get("/ping")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+        return (requests // concurrency * concurrency) / (time.perf_counter() - start)
+
+
+async def main(requests: int) -> None:
+    logging.disable(logging.CRITICAL)
+    variants = [
+        ("no middleware", build_app()),
+        ("BaseHTTPMiddleware (before)", build_app(BaseHTTPLogMiddleware)),
+        ("pure ASGI (after)", build_app(LogMiddleware)),
+    ]
+    for name, app in variants:
+        rps = await measure(app, requests)
+        print(f"{name:<30} {rps:>10.0f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
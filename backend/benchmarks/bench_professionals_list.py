@@ -0,0 +1,131 @@
+"""Statements and time to list a page of professionals, before and after eager loading.
+
+Seeds thousands of professionals (each with a user and a few services)
+into DATABASE_URL, then lists pages of them three ways:
+
+- lazy loading (before): the original sync query, with `user` and
+  `services` loaded per row while the response is serialized;
+- eager loading (after): GET /professionals;
+- directory: GET /professionals/directory, the lean projection.
+
+Timings include serializing the response models. Seeded rows are deleted
+at the end.
+
+    cd backend && python -m benchmarks.bench_professionals_list [professionals]
+"""
+import asyncio
+import logging
+import sys
+import time
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, select
+
+from app.api.v1.endpoints.professionals import read_professionals, read_professionals_directory
+from app.core.database import AsyncSessionLocal, SessionLocal, async_engine
+from app.core.query_stats import query_stats_scope
+from app.models.professional import Professional as ProfessionalModel
+from app.models.service import Service as ServiceModel
+from app.models.user import User, UserType
+from app.schemas.professional import Professional, ProfessionalSummary
+
+SPECIALITY = "Bench Speciality"
+EMAIL_DOMAIN = "bench.example.com"
+SERVICES_PER_PROFESSIONAL = 3
+PAGE_SIZES = (100, 1000)
+REPEAT = 5
+
+full_adapter = TypeAdapter(List[Professional])
+summary_adapter = TypeAdapter(List[ProfessionalSummary])
+
+
+def seed(count: int) -> None:
+    with SessionLocal() as db:
+        users = db.execute(insert(User).returning(User.id), [
+            {"email": f"bench-{n}@{EMAIL_DOMAIN}", "password": "!", "name": f"Bench {n}",
+             "type": UserType.PROFESSIONAL, "active": True}
+            for n in range(count)
+        ]).scalars().all()
+        professionals = db.execute(insert(ProfessionalModel).returning(ProfessionalModel.id), [
+            {"user_id": user_id, "speciality": SPECIALITY, "address": "Rua do Benchmark, 1"}
+            for user_id in users
+        ]).scalars().all()
+        db.execute(insert(ServiceModel), [
+            {"professional_id": pid, "name": f"Service {n}", "duration": 30, "price": 100}
+            for pid in professionals for n in range(SERVICES_PER_PROFESSIONAL)
+        ])
+        db.commit()
+
+
+def cleanup() -> None:
+    with SessionLocal() as db:
+        user_ids = select(User.id).where(User.email.like(f"bench-%@{EMAIL_DOMAIN}"))
+        professional_ids = select(ProfessionalModel.id).where(ProfessionalModel.user_id.in_(user_ids))
+        db.execute(delete(ServiceModel).where(ServiceModel.professional_id.in_(professional_ids)))
+        db.execute(delete(ProfessionalModel).where(ProfessionalModel.user_id.in_(user_ids)))
+        db.execute(delete(User).where(User.email.like(f"bench-%@{EMAIL_DOMAIN}")))
+        db.commit()
+
+
+def list_lazy(limit: int) -> bytes:
+    """The listing as it was before eager loading."""
+    with SessionLocal() as db:
+        professionals = (
+            db.query(ProfessionalModel).join(User)
+            .filter(User.active == True, ProfessionalModel.speciality.ilike(f"%{SPECIALITY}%"))
+            .offset(0).limit(limit).all()
+        )
+        return full_adapter.dump_json(full_adapter.validate_python(professionals, from_attributes=True))
+
+
+async def list_eager(limit: int) -> bytes:
+    async with AsyncSessionLocal() as db:
+        professionals = await read_professionals(db=db, skip=0, limit=limit, especialidade=SPECIALITY)
+        return full_adapter.dump_json(full_adapter.validate_python(professionals, from_attributes=True))
+
+
+async def list_directory(limit: int) -> bytes:
+    async with AsyncSessionLocal() as db:
+        rows = await read_professionals_directory(db=db, skip=0, limit=limit, especialidade=SPECIALITY)
+        return summary_adapter.dump_json(summary_adapter.validate_python(rows, from_attributes=True))
+
+
+async def measure(listing: Callable, limit: int) -> tuple:
+    """Best wall time over REPEAT runs, statements per run and response size."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        with query_stats_scope() as stats:
+            start = time.perf_counter()
+            result = listing(limit)
+            body = await result if asyncio.iscoroutine(result) else result
+            best = min(best, time.perf_counter() - start)
+    return best * 1000, stats.count, len(body)
+
+
+async def run() -> None:
+    variants = [
+        ("lazy loading (before)", list_lazy),
+        ("eager loading (after)", list_eager),
+        ("directory projection", list_directory),
+    ]
+    for limit in PAGE_SIZES:
+        print(f"page of {limit}:")
+        for name, listing in variants:
+            ms, statements, size = await measure(listing, limit)
+            print(f"  {name:<24} {statements:>5} statements {ms:>9.1f} ms {size / 1024:>8.0f} KiB")
+    await async_engine.dispose()
+
+
+def main(count: int) -> None:
+    logging.disable(logging.CRITICAL)
+    cleanup()
+    seed(count)
+    try:
+        asyncio.run(run())
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
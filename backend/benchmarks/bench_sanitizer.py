@@ -0,0 +1,49 @@
+"""CPU cost of sanitizing log metadata.
+
+Compares the previous sanitizer (rebuilds the sensitive set on every call
+and copies every container) with the current one, for a typical clean
+frontend payload, and times the current one on a huge payload, which the
+LOG_SANITIZE_MAX_ITEMS budget cuts short.
+
+    cd backend && python -m benchmarks.bench_sanitizer [iterations]
+"""
+import sys
+import timeit
+
+from app.core.logging.log_settings import log_settings
+from app.core.logging.sanitizer import REDACTED, sanitize
+
+
+def legacy_sanitize(data, _sensitive=None):
+    """The copy-everything sanitizer `sanitize` replaced."""
+    if _sensitive is None:
+        _sensitive = set(f.strip().lower() for f in log_settings.LOG_SENSITIVE_FIELDS.split(",") if f.strip())
+    if isinstance(data, dict):
+        return {k: REDACTED if k.lower() in _sensitive else legacy_sanitize(v, _sensitive) for k, v in data.items()}
+    if isinstance(data, list):
+        return [legacy_sanitize(item, _sensitive) for item in data]
+    if isinstance(data, str) and len(data) > log_settings.LOG_MAX_FIELD_LENGTH:
+        return data[: log_settings.LOG_MAX_FIELD_LENGTH] + "...[TRUNCATED]"
+    return data
+
+
+def main(iterations: int) -> None:
+    payload = {
+        "page": "/agenda",
+        "filters": {"especialidade": "Dentista", "dias": [1, 2, 3]},
+        "events": [{"type": "click", "target": f"button-{n}", "ts": n} for n in range(20)],
+    }
+    before = min(timeit.repeat(lambda: legacy_sanitize(payload), number=iterations, repeat=5))
+    after = min(timeit.repeat(lambda: sanitize(payload), number=iterations, repeat=5))
+    before, after = before / iterations * 1e6, after / iterations * 1e6
+    print(f"{'clean payload (20 events)':<28} copying (before) {before:6.1f}us   current (after) {after:6.1f}us"
+          f"   {before / after:4.1f}x")
+
+    huge = {"rows": [{"a": n, "b": [n] * 10} for n in range(200_000)]}
+    cost = min(timeit.repeat(lambda: sanitize(huge), number=10, repeat=5)) / 10 * 1e3
+    print(f"{'huge payload (200k rows)':<28} current {cost:.2f}ms"
+          f" (budget of {log_settings.LOG_SANITIZE_MAX_ITEMS} items)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
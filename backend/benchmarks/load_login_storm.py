@@ -0,0 +1,127 @@
+"""Latency of an unrelated endpoint while a burst of logins is in flight.
+
+Runs in-process over httpx's ASGI transport, so every request shares one
+event loop exactly as they would inside one uvicorn worker. A background
+storm of logins hits either the previous login (sync query and bcrypt on
+the event loop) or the current one (async query, bcrypt on the hashing
+executor), while a probe measures GET /ping.
+
+    cd backend && python -m benchmarks.load_login_storm [logins] [concurrency]
+"""
+import asyncio
+import logging
+import statistics
+import sys
+import time
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.api.v1.endpoints import auth
+from app.core.database import SessionLocal, async_engine
+from app.core.security import get_password_hash
+from app.crud.crud_user import user as crud_user
+from app.models.user import User, UserType
+
+EMAIL = "login-storm@bench.example.com"
+PASSWORD = "password123"
+
+
+async def blocking_login(
+    db: Session = Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()
+) -> dict:
+    """The previous login: an async endpoint calling the sync authenticate."""
+    user = crud_user.authenticate(db, email=form_data.username, password=form_data.password)
+    if not user:
+        raise HTTPException(status_code=400, detail="Incorrect email or password")
+    return {}
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/auth")
+    app.add_api_route("/auth/blocking-access-token", blocking_login, methods=["POST"])
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    return app
+
+
+async def storm(client: httpx.AsyncClient, path: str, logins: int, concurrency: int) -> None:
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            r = await client.post(path, data={"username": EMAIL, "password": PASSWORD})
+            assert r.status_code == 200, r.text
+
+    await asyncio.gather(*(worker(logins // concurrency) for _ in range(concurrency)))
+
+
+async def probe(client: httpx.AsyncClient, done: asyncio.Event, interval: float = 0.01) -> list:
+    """
+    Send GET /ping on a fixed schedule and time each from when it was due.
+
+    Timing from the schedule rather than from the send counts the time a
+    request spent waiting for a blocked loop, as an outside client would.
+    """
+    latencies = []
+    due = time.perf_counter()
+    while not done.is_set():
+        due += interval
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        await client.get("/ping")
+        latencies.append((time.perf_counter() - due) * 1000)
+    return latencies
+
+
+async def measure(path: str, logins: int, concurrency: int) -> tuple:
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post(path, data={"username": EMAIL, "password": PASSWORD})  # warm-up
+        done = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, done))
+        start = time.perf_counter()
+        await storm(client, path, logins, concurrency)
+        elapsed = time.perf_counter() - start
+        done.set()
+        latencies = await probe_task
+    p99 = statistics.quantiles(latencies, n=100, method="inclusive")[98]
+    return statistics.median(latencies), p99, max(latencies), logins / elapsed
+
+
+async def run(logins: int, concurrency: int) -> None:
+    variants = [
+        ("bcrypt on event loop (before)", "/auth/blocking-access-token"),
+        ("bcrypt on executor (after)", "/auth/access-token"),
+    ]
+    print(f"{logins} logins, {concurrency} concurrent; latency of GET /ping during the storm:")
+    for name, path in variants:
+        p50, p99, worst, rate = await measure(path, logins, concurrency)
+        print(f"  {name:<30} p50 {p50:7.1f} ms  p99 {p99:7.1f} ms  max {worst:7.1f} ms  ({rate:.1f} logins/s)")
+    await async_engine.dispose()
+
+
+def main(logins: int, concurrency: int) -> None:
+    logging.disable(logging.CRITICAL)
+    with SessionLocal() as db:
+        db.execute(delete(User).where(User.email == EMAIL))
+        db.add(User(email=EMAIL, password=get_password_hash(PASSWORD), name="Login Storm", type=UserType.CLIENT))
+        db.commit()
+    try:
+        asyncio.run(run(logins, concurrency))
+    finally:
+        with SessionLocal() as db:
+            db.execute(delete(User).where(User.email == EMAIL))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 40,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+    )
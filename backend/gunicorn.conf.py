@@ -0,0 +1,43 @@
+"""Gunicorn settings for running several uvicorn workers.
+
+    PROMETHEUS_MULTIPROC_DIR=/tmp/prometheus gunicorn -c gunicorn.conf.py app.main:app
+
+The Dockerfile and the Procfile both start the app this way.
+
+Every worker runs the app lifespan; the schema and default data are created
+under a Postgres advisory lock (app/main.py), so only the first worker does
+the work.
+
+The available-slots cache (app/services/availability_cache.py) and the user
+cache (app/services/user_cache.py) live in each worker's memory. A write
+only invalidates the cache of the worker that handled it, so the other
+workers can serve availability or accept a changed, deactivated or deleted
+user for up to AVAILABILITY_CACHE_TTL_SECONDS / USER_CACHE_TTL_SECONDS
+(30s by default). Lower those settings, or set WEB_CONCURRENCY=1, where
+that matters.
+
+With PROMETHEUS_MULTIPROC_DIR set, /metrics aggregates every worker (see
+app/core/metrics.py).
+"""
+import os
+import shutil
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+forwarded_allow_ips = "*"
+
+
+def on_starting(server):
+    # Samples left by a previous run would be added to the new totals
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -8,6 +8,7 @@ os.environ["SECRET_KEY"] = "test_secret_key_for_pytest"
 
 from app.main import app
 from app.core.database import SessionLocal
+from app.core.logging.log_service import LogService
 from app.crud.crud_user import user as crud_user
 from app.schemas.user import UserCreate
 from app.models.user import UserType
@@ -41,3 +42,84 @@ def normal_user(db) -> Generator:
     yield user
     # Cleanup if needed, but for now we keep it or rely on test DB reset
     # crud_user.remove(db, id=user.id) 
+
+# Cria profissional com um serviço e expediente de segunda a sexta
+@pytest.fixture(scope="module")
+def professional(db) -> Generator:
+    from datetime import time
+    from app.models.professional import Professional
+    from app.models.service import Service
+    from app.models.working_hours import WorkingHours
+
+    email = "test_professional@example.com"
+    user = crud_user.get_by_email(db, email=email)
+    if not user:
+        user = crud_user.create(db, obj_in=UserCreate(
+            email=email,
+            password="password123",
+            name="Test Professional",
+            type=UserType.PROFESSIONAL,
+            active=True
+        ))
+    professional = db.query(Professional).filter(Professional.user_id == user.id).first()
+    if not professional:
+        professional = Professional(user_id=user.id, speciality="Test Speciality")
+        db.add(professional)
+        db.flush()
+        db.add(Service(professional_id=professional.id, name="Test Service", duration=30, price=100))
+        db.add_all([
+            WorkingHours(professional_id=professional.id, day_of_week=day,
+                         start_time=time(9, 0), end_time=time(12, 0), active=True)
+            for day in range(5)
+        ])
+        db.commit()
+        db.refresh(professional)
+    yield professional
+
+# Serviço de log que guarda os documentos em memória em vez de enviá-los ao MongoDB
+class RecordingLogService(LogService):
+    def __init__(self):
+        self.documents = []
+
+    def _fire_and_forget(self, doc) -> None:
+        self.documents.append(doc)
+
+
+@pytest.fixture
+def recording_log_service() -> RecordingLogService:
+    return RecordingLogService()
+
+
+# App mínimo com as rotas de `router` atrás do LogMiddleware, registrando em recording_log_service.
+# Uso: client = make_log_client(router) ou make_log_client(router, sampler)
+@pytest.fixture
+def make_log_client(recording_log_service):
+    from fastapi import FastAPI
+    from app.core.logging.log_middleware import LogMiddleware
+    from app.core.logging.sampling import HttpSampler
+
+    def make(router, sampler=None) -> TestClient:
+        log_app = FastAPI()
+        log_app.add_middleware(
+            LogMiddleware, log_service=recording_log_service, sampler=sampler or HttpSampler([], 1000)
+        )
+        log_app.include_router(router)
+        return TestClient(log_app)
+
+    return make
+
+# Limite de statements SQL por requisição, para que regressões N+1 quebrem o CI.
+# Conta pelo mesmo QueryStats que alimenta o log de acesso (app/core/query_stats.py).
+# Uso: with assert_max_queries(3): client.get(...)
+@pytest.fixture
+def assert_max_queries():
+    from contextlib import contextmanager
+    from app.core.query_stats import query_stats_scope
+
+    @contextmanager
+    def check(limit: int):
+        with query_stats_scope() as stats:
+            yield stats
+        assert stats.count <= limit, f"{stats.count} SQL statements (limit {limit})"
+
+    return check
@@ -0,0 +1,337 @@
+from datetime import date, datetime, time, timedelta
+
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.models.availability_bitmap import AvailabilityBitmap
+
+
+def _monday_after(days: int) -> date:
+    day = date.today() + timedelta(days=days)
+    return day + timedelta(days=-day.weekday() % 7)
+
+
+def _monday_in_horizon() -> date:
+    return _monday_after(7)
+
+
+def test_available_slots_range_matches_single_day(client: TestClient, professional) -> None:
+    service_id = professional.services[0].id
+    params = {
+        "professional_id": professional.id,
+        "service_id": service_id,
+        "start_date": "2030-01-06",  # domingo
+        "end_date": "2030-01-12",
+    }
+    r = client.get(f"{settings.API_V1_STR}/appointments/available-slots/range", params=params)
+    assert r.status_code == 200
+    days = r.json()["days"]
+    assert [d["date"] for d in days][0] == "2030-01-06"
+    assert len(days) == 7
+    assert days[0]["slots"] == []  # sem expediente no domingo
+    assert days[1]["slots"][0] == "09:00"
+
+    for day in days:
+        r = client.get(
+            f"{settings.API_V1_STR}/appointments/available-slots",
+            params={"professional_id": professional.id, "service_id": service_id, "date": day["date"]},
+        )
+        assert r.json()["slots"] == day["slots"]
+
+
+def test_available_slots_range_rejects_long_window(client: TestClient, professional) -> None:
+    params = {
+        "professional_id": professional.id,
+        "service_id": professional.services[0].id,
+        "start_date": "2030-01-01",
+        "end_date": "2030-03-01",
+    }
+    r = client.get(f"{settings.API_V1_STR}/appointments/available-slots/range", params=params)
+    assert r.status_code == 400
+
+
+def test_first_available_across_professionals(client: TestClient, professional) -> None:
+    params = {
+        "especialidade": professional.speciality,
+        "start_date": "2030-01-05",  # sábado
+        "end_date": "2030-01-12",
+        "limit": 3,
+    }
+    r = client.get(f"{settings.API_V1_STR}/appointments/first-available", params=params)
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert len(results) == 3
+    assert results[0]["date"] == "2030-01-07"
+    assert results[0]["slot"] == "09:00"
+    assert [(x["date"], x["slot"]) for x in results] == sorted((x["date"], x["slot"]) for x in results)
+
+
+def test_first_available_searches_every_service(client: TestClient, professional) -> None:
+    login_data = {"username": "test_professional@example.com", "password": "password123"}
+    token = client.post(f"{settings.API_V1_STR}/auth/access-token", data=login_data).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    r = client.post(f"{settings.API_V1_STR}/services/", json={
+        "professional_id": professional.id, "name": "Long Service", "duration": 45, "price": 10,
+    }, headers=headers)
+    long_id = r.json()["id"]
+
+    params = {"especialidade": professional.speciality, "start_date": "2030-01-07", "end_date": "2030-01-07", "limit": 100}
+    results = client.get(f"{settings.API_V1_STR}/appointments/first-available", params=params).json()["results"]
+    mine = [x for x in results if x["professional_id"] == professional.id]
+
+    # Cada serviço com a própria duração: 09:00-12:00 cabe 6 de 30min e 4 de 45min
+    by_service = {}
+    for x in mine:
+        by_service.setdefault(x["service_id"], []).append(x["slot"])
+    assert by_service[professional.services[0].id] == ["09:00", "09:30", "10:00", "10:30", "11:00", "11:30"]
+    assert by_service[long_id] == ["09:00", "09:45", "10:30", "11:15"]
+
+    # Limpeza
+    assert client.delete(f"{settings.API_V1_STR}/services/{long_id}", headers=headers).status_code == 200
+
+
+def test_first_available_requires_filter(client: TestClient) -> None:
+    params = {"start_date": "2030-01-05", "end_date": "2030-01-12"}
+    r = client.get(f"{settings.API_V1_STR}/appointments/first-available", params=params)
+    assert r.status_code == 400
+
+
+def _cache_hits(client: TestClient) -> float:
+    from prometheus_client.parser import text_string_to_metric_families
+
+    for family in text_string_to_metric_families(client.get("/metrics").text):
+        for s in family.samples:
+            if s.name == "availability_cache_lookups_total" and s.labels.get("result") == "hit":
+                return s.value
+    return 0.0
+
+
+def test_booking_invalidates_cached_slots(client: TestClient, professional, normal_user) -> None:
+    service_id = professional.services[0].id
+    day = _monday_in_horizon()
+    params = {"professional_id": professional.id, "service_id": service_id, "date": str(day)}
+    url = f"{settings.API_V1_STR}/appointments/available-slots"
+
+    before = client.get(url, params=params).json()["slots"]
+    hits = _cache_hits(client)
+    assert client.get(url, params=params).json()["slots"] == before
+    assert _cache_hits(client) == hits + 1
+
+    login_data = {"username": normal_user.email, "password": "password123"}
+    token = client.post(f"{settings.API_V1_STR}/auth/access-token", data=login_data).json()["access_token"]
+    r = client.post(
+        f"{settings.API_V1_STR}/appointments/",
+        json={
+            "professional_id": professional.id,
+            "service_id": service_id,
+            "date_time": f"{day}T{before[0]}:00",
+            "duration": 30,
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert r.status_code == 200
+
+    after = client.get(url, params=params).json()["slots"]
+    assert after == before[1:]
+
+    # Limpeza: cancelar pela API mantém o bitmap de disponibilidade em dia
+    r = client.delete(
+        f"{settings.API_V1_STR}/appointments/{r.json()['id']}",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert r.status_code == 200
+    assert client.get(url, params=params).json()["slots"] == before
+
+
+def _bitmap_dates(db, professional_id: int) -> set:
+    db.expire_all()
+    rows = db.query(AvailabilityBitmap.date).filter(AvailabilityBitmap.professional_id == professional_id)
+    return {row.date for row in rows}
+
+
+def test_available_slots_read_stores_nothing(client: TestClient, professional, db) -> None:
+    day = _monday_in_horizon() + timedelta(days=14)
+    db.query(AvailabilityBitmap).filter(
+        AvailabilityBitmap.professional_id == professional.id, AvailabilityBitmap.date == day
+    ).delete()
+    db.commit()
+
+    params = {"professional_id": professional.id, "service_id": professional.services[0].id, "date": str(day)}
+    r = client.get(f"{settings.API_V1_STR}/appointments/available-slots", params=params)
+    assert r.status_code == 200
+    assert r.json()["slots"][0] == "09:00"
+
+    # Leituras anônimas nunca gravam bitmaps
+    assert day not in _bitmap_dates(db, professional.id)
+
+
+def test_bitmaps_stored_only_within_horizon(client: TestClient, professional, db) -> None:
+    login_data = {"username": "test_professional@example.com", "password": "password123"}
+    token = client.post(f"{settings.API_V1_STR}/auth/access-token", data=login_data).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    inside = _monday_in_horizon()
+    outside = _monday_after(settings.AVAILABILITY_BITMAP_HORIZON_DAYS + 1)
+    past = date.today() - timedelta(days=3)
+    db.merge(AvailabilityBitmap(professional_id=professional.id, date=past, busy=b"", updated_at=datetime.utcnow()))
+    db.commit()
+
+    ids = []
+    for day in (inside, outside):
+        r = client.post(f"{settings.API_V1_STR}/blocks/", json={
+            "professional_id": professional.id,
+            "start_time": f"{day}T10:00:00",
+            "end_time": f"{day}T11:00:00",
+        }, headers=headers)
+        assert r.status_code == 200
+        ids.append(r.json()["id"])
+
+    # Só o dia dentro do horizonte é gravado; os dias passados são removidos
+    stored = _bitmap_dates(db, professional.id)
+    assert inside in stored
+    assert outside not in stored
+    assert past not in stored
+
+    # Fora do horizonte o bloqueio continua valendo, calculado na hora
+    params = {"professional_id": professional.id, "service_id": professional.services[0].id, "date": str(outside)}
+    slots = client.get(f"{settings.API_V1_STR}/appointments/available-slots", params=params).json()["slots"]
+    assert "10:00" not in slots and "10:30" not in slots
+
+    # Limpeza
+    for block_id in ids:
+        client.delete(f"{settings.API_V1_STR}/blocks/{block_id}", headers=headers)
+
+
+def test_slot_endpoints_agree_off_grid(client: TestClient, professional, db) -> None:
+    from app.services.availability import day_slots
+    from app.services.availability_loader import load_busy_by_day
+
+    login_data = {"username": "test_professional@example.com", "password": "password123"}
+    token = client.post(f"{settings.API_V1_STR}/auth/access-token", data=login_data).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    r = client.post(f"{settings.API_V1_STR}/services/", json={
+        "professional_id": professional.id, "name": "Off Grid Service", "duration": 17, "price": 10,
+    }, headers=headers)
+    service_id = r.json()["id"]
+    stored = _monday_in_horizon() + timedelta(days=21)
+    computed = _monday_after(settings.AVAILABILITY_BITMAP_HORIZON_DAYS + 1)
+
+    # Bloqueio e agendamento fora da grade de 5 minutos
+    created = []
+    for day in (stored, computed):
+        r = client.post(f"{settings.API_V1_STR}/blocks/", json={
+            "professional_id": professional.id,
+            "start_time": f"{day}T09:03:00",
+            "end_time": f"{day}T09:16:00",
+        }, headers=headers)
+        assert r.status_code == 200
+        created.append(f"/blocks/{r.json()['id']}")
+        r = client.post(f"{settings.API_V1_STR}/appointments/", json={
+            "professional_id": professional.id,
+            "service_id": professional.services[0].id,
+            "date_time": f"{day}T10:02:00",
+            "duration": 30,
+        }, headers=headers)
+        assert r.status_code == 200
+        created.append(f"/appointments/{r.json()['id']}")
+
+    for day in (stored, computed):
+        params = {"professional_id": professional.id, "service_id": service_id}
+        single = client.get(
+            f"{settings.API_V1_STR}/appointments/available-slots", params={**params, "date": str(day)}
+        ).json()["slots"]
+        ranged = client.get(
+            f"{settings.API_V1_STR}/appointments/available-slots/range",
+            params={**params, "start_date": str(day), "end_date": str(day)},
+        ).json()["days"][0]["slots"]
+        first = client.get(f"{settings.API_V1_STR}/appointments/first-available", params={
+            "service_name": "Off Grid Service", "start_date": str(day), "end_date": str(day), "limit": 100,
+        }).json()["results"]
+
+        # As três rotas e a varredura exata por intervalos dão a mesma resposta
+        busy = load_busy_by_day(db, [professional.id], day, day).get((professional.id, day), [])
+        exact = day_slots(day, time(9), time(12), 17, busy)
+        assert single == ranged == [x["slot"] for x in first] == exact
+        assert single[:2] == ["09:17", "09:34"]
+        assert "09:51" not in single and "10:25" not in single and "10:42" in single
+
+    # Limpeza
+    for path in created:
+        assert client.delete(f"{settings.API_V1_STR}{path}", headers=headers).status_code == 200
+    assert client.delete(f"{settings.API_V1_STR}/services/{service_id}", headers=headers).status_code == 200
+
+
+def test_service_update_invalidates_cached_slots(client: TestClient, professional) -> None:
+    login_data = {"username": "test_professional@example.com", "password": "password123"}
+    token = client.post(f"{settings.API_V1_STR}/auth/access-token", data=login_data).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    r = client.post(f"{settings.API_V1_STR}/services/", json={
+        "professional_id": professional.id, "name": "Cache Service", "duration": 30, "price": 10,
+    }, headers=headers)
+    service_id = r.json()["id"]
+    params = {"professional_id": professional.id, "service_id": service_id, "date": "2030-02-11"}
+    url = f"{settings.API_V1_STR}/appointments/available-slots"
+
+    before = client.get(url, params=params).json()["slots"]
+    r = client.put(f"{settings.API_V1_STR}/services/{service_id}", json={"duration": 120}, headers=headers)
+    assert r.status_code == 200
+
+    # Expediente 09:00-12:00: cabem bem menos serviços de 2h
+    after = client.get(url, params=params).json()["slots"]
+    assert len(after) < len(before)
+
+    # Limpeza
+    r = client.delete(f"{settings.API_V1_STR}/services/{service_id}", headers=headers)
+    assert r.status_code == 200, r.text
+
+
+def test_parallel_bookings_for_same_slot(client: TestClient, professional, normal_user) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    login_data = {"username": normal_user.email, "password": "password123"}
+    token = client.post(f"{settings.API_V1_STR}/auth/access-token", data=login_data).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    booking = {
+        "professional_id": professional.id,
+        "service_id": professional.services[0].id,
+        "date_time": "2030-02-05T10:00:00",
+        "duration": 30,
+    }
+
+    def book(_):
+        return client.post(f"{settings.API_V1_STR}/appointments/", json=booking, headers=headers)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(book, range(8)))
+
+    codes = sorted(r.status_code for r in responses)
+    assert codes == [200] + [409] * 7
+
+    # Limpeza
+    created = next(r for r in responses if r.status_code == 200).json()
+    client.delete(f"{settings.API_V1_STR}/appointments/{created['id']}", headers=headers)
+
+
+def test_my_appointments_lists_own_bookings(client: TestClient, professional, normal_user) -> None:
+    login_data = {"username": normal_user.email, "password": "password123"}
+    token = client.post(f"{settings.API_V1_STR}/auth/access-token", data=login_data).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    r = client.post(
+        f"{settings.API_V1_STR}/appointments/",
+        json={
+            "professional_id": professional.id,
+            "service_id": professional.services[0].id,
+            "date_time": "2030-02-06T09:00:00",
+            "duration": 30,
+        },
+        headers=headers,
+    )
+    assert r.status_code == 200
+    created = r.json()
+
+    r = client.get(f"{settings.API_V1_STR}/appointments/my-appointments", headers=headers)
+    assert r.status_code == 200
+    mine = next(a for a in r.json() if a["id"] == created["id"])
+    assert mine["professional_name"] == "Test Professional"
+    assert mine["service_name"] == "Test Service"
+
+    # Limpeza
+    client.delete(f"{settings.API_V1_STR}/appointments/{created['id']}", headers=headers)
@@ -1,5 +1,10 @@
+import asyncio
+import time
+
+import pytest
 from fastapi.testclient import TestClient
 from app.core.config import settings
+from app.core.security import get_password_hash, verify_password_async
 from app.models.user import User
 
 def test_login_access_token(client: TestClient, normal_user: User) -> None:
@@ -21,3 +26,30 @@ def test_login_access_token_invalid(client: TestClient) -> None:
     r = client.post(f"{settings.API_V1_STR}/auth/access-token", data=login_data)
     assert r.status_code == 400
     assert r.json()["error"] == "Incorrect email or password"
+
+def test_login_wrong_password(client: TestClient, normal_user: User) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/auth/access-token",
+        data={"username": normal_user.email, "password": "wrongpassword"},
+    )
+    assert r.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_password_checks_do_not_block_event_loop() -> None:
+    hashed = get_password_hash("password123")
+    lag = 0.0
+
+    async def ticker():
+        nonlocal lag
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lag = max(lag, time.perf_counter() - start - 0.005)
+
+    task = asyncio.create_task(ticker())
+    results = await asyncio.gather(*(verify_password_async("password123", hashed) for _ in range(6)))
+    task.cancel()
+    assert all(results)
+    # Seis bcrypts seguidos no loop o travariam por centenas de ms
+    assert lag < 0.05, f"event loop stalled for {lag * 1000:.0f}ms"
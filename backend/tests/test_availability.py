@@ -0,0 +1,81 @@
+import random
+from datetime import date, datetime, time, timedelta
+
+from app.services.availability import coalesce_intervals, day_slots, free_slots, upcoming_slots
+from app.services.availability_bitmap import build_bitmap, busy_intervals, from_bytes, to_bytes
+
+DAY = date(2026, 3, 10)
+
+
+def at(hour: int, minute: int = 0) -> datetime:
+    return datetime.combine(DAY, time(hour, minute))
+
+
+def naive_slots(start, end, duration, busy):
+    """Reference implementation: every slot against every busy interval."""
+    slots = []
+    current = start
+    while current + duration <= end:
+        if not any(current < b_end and current + duration > b_start for b_start, b_end in busy):
+            slots.append(current)
+        current += duration
+    return slots
+
+
+def test_coalesce_merges_overlapping_and_touching():
+    busy = [(at(10), at(11)), (at(8), at(9)), (at(9), at(9, 30)), (at(10, 30), at(10, 45))]
+    assert coalesce_intervals(busy) == [(at(8), at(9, 30)), (at(10), at(11))]
+
+
+def test_free_slots_skips_busy_intervals():
+    busy = coalesce_intervals([(at(9), at(10)), (at(11, 15), at(11, 45))])
+    slots = free_slots(at(8), at(13), timedelta(minutes=30), busy)
+    assert slots == [at(8), at(8, 30), at(10), at(10, 30), at(12), at(12, 30)]
+
+
+def test_day_slots_formats_and_respects_working_hours():
+    busy = [(at(8, 10), at(8, 20))]
+    assert day_slots(DAY, time(8), time(10), 45, busy) == ["08:45"]
+
+
+def test_upcoming_slots_drops_started_ones():
+    slots = ["08:00", "08:30", "09:00"]
+    assert upcoming_slots(DAY, slots, at(8, 30)) == ["08:30", "09:00"]
+    assert upcoming_slots(DAY, slots, at(8, 30) + timedelta(seconds=1)) == ["09:00"]
+    assert upcoming_slots(DAY, slots, at(0) - timedelta(days=1)) == slots
+    assert upcoming_slots(DAY, slots, at(0) + timedelta(days=1)) == []
+
+
+def test_block_spanning_whole_day():
+    busy = [(at(0) - timedelta(days=1), at(0) + timedelta(days=1))]
+    assert day_slots(DAY, time(8), time(18), 30, busy) == []
+
+
+def test_matches_naive_reference():
+    rng = random.Random(42)
+    for _ in range(500):
+        duration = timedelta(minutes=rng.choice([15, 20, 30, 45, 60]))
+        busy = []
+        for _ in range(rng.randint(0, 20)):
+            start = at(6) + timedelta(minutes=rng.randint(0, 14 * 60))
+            busy.append((start, start + timedelta(minutes=rng.randint(0, 120))))
+        expected = naive_slots(at(8), at(18), duration, busy)
+        assert free_slots(at(8), at(18), duration, coalesce_intervals(busy)) == expected
+
+
+def test_bitmap_round_trip_keeps_sweep_answer():
+    rng = random.Random(7)
+    for _ in range(300):
+        duration = rng.choice([7, 13, 15, 20, 25, 30, 45, 60])
+        work_start = time(8, rng.randint(0, 59))
+        busy = []
+        for _ in range(rng.randint(0, 15)):
+            start = at(0) + timedelta(minutes=rng.randint(0, 24 * 60 - 1), seconds=rng.randint(0, 59))
+            busy.append((start, start + timedelta(minutes=rng.randint(1, 150))))
+        cached = busy_intervals(DAY, from_bytes(to_bytes(build_bitmap(DAY, busy))))
+        assert day_slots(DAY, work_start, time(18), duration, cached) == day_slots(DAY, work_start, time(18), duration, busy)
+
+
+def test_bitmap_rounds_partial_minutes_to_busy():
+    bits = build_bitmap(DAY, [(at(9, 2) + timedelta(seconds=30), at(9, 6) + timedelta(seconds=1)), (at(23, 59), at(23, 59) + timedelta(hours=2))])
+    assert busy_intervals(DAY, bits) == [(at(9, 2), at(9, 7)), (at(23, 59), at(0) + timedelta(days=1))]
@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+from app.core.cache import LRUCache
+
+
+def test_lru_eviction_and_counters():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" passa a ser o menos recente
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    assert stats["size"] == 2
+
+
+def test_ttl_expiry():
+    cache = LRUCache(max_size=10, ttl_seconds=30)
+    with patch("app.core.cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+    with patch("app.core.cache.time.monotonic", return_value=129.0):
+        assert cache.get("a") == 1
+    with patch("app.core.cache.time.monotonic", return_value=131.0):
+        assert cache.get("a") is None
+
+
+def test_invalidate_by_predicate():
+    cache = LRUCache(max_size=10)
+    cache.set((1, "2030-01-07"), ["09:00"])
+    cache.set((1, "2030-01-08"), ["09:00"])
+    cache.set((2, "2030-01-07"), ["09:00"])
+
+    assert cache.invalidate(lambda key: key == (1, "2030-01-07")) == 1
+    assert cache.get((1, "2030-01-07")) is None
+    assert cache.get((1, "2030-01-08")) == ["09:00"]
+    assert cache.invalidate(lambda key: key[0] == 1) == 1
+    assert cache.get((2, "2030-01-07")) == ["09:00"]
+
+
+def test_stale_generation_is_not_stored():
+    cache = LRUCache(max_size=10)
+    generation = cache.generation
+    cache.invalidate(lambda key: True)  # escrita concorrente durante o cálculo
+    cache.set("a", 1, generation=generation)
+    assert cache.get("a") is None
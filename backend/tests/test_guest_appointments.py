@@ -0,0 +1,144 @@
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+from app.core import security
+from app.core.config import settings
+from app.models.appointment import Appointment
+from app.models.user import User
+from app.services import availability_bitmap
+
+GUEST_EMAIL = "guest_claim@example.com"
+
+
+def _remove_guest(db) -> None:
+    user = db.query(User).filter(User.email == GUEST_EMAIL).first()
+    if user:
+        appointments = db.query(Appointment).filter(Appointment.client_id == user.id).all()
+        for appointment in appointments:
+            db.delete(appointment)
+        db.flush()
+        for appointment in appointments:
+            availability_bitmap.refresh_days(db, appointment.professional_id, [appointment.date_time.date()])
+        db.delete(user)
+        db.commit()
+
+
+def _book(client: TestClient, professional, date_time: str):
+    return client.post(f"{settings.API_V1_STR}/guest-appointments/", json={
+        "professional_id": professional.id,
+        "service_id": professional.services[0].id,
+        "date_time": date_time,
+        "duration": 30,
+        "client_name": "Guest Claim",
+        "client_email": GUEST_EMAIL,
+        "client_phone": "11999999999",
+    })
+
+
+def test_unusable_password_never_verifies() -> None:
+    marker = security.make_unusable_password()
+    assert marker.startswith(security.UNUSABLE_PASSWORD_PREFIX)
+    assert not security.has_usable_password(marker)
+    assert not security.verify_password(marker, marker)
+    assert not security.verify_password("", marker)
+
+
+def test_guest_booking_then_claim_account(client: TestClient, professional, db) -> None:
+    _remove_guest(db)
+    r = _book(client, professional, "2030-02-07T10:00:00")
+    assert r.status_code == 200
+
+    # Convidado criado sem bcrypt: não consegue logar com nenhuma senha
+    guest = db.query(User).filter(User.email == GUEST_EMAIL).first()
+    assert not security.has_usable_password(guest.password)
+    login_data = {"username": GUEST_EMAIL, "password": guest.password}
+    assert client.post(f"{settings.API_V1_STR}/auth/access-token", data=login_data).status_code == 400
+
+    # Resposta idêntica para convidados e emails desconhecidos
+    for email in (GUEST_EMAIL, "nobody@example.com"):
+        r = client.post(f"{settings.API_V1_STR}/auth/claim-account/request", json={"email": email})
+        assert r.status_code == 202
+
+    token = security.create_claim_account_token(guest.id, guest.password)
+    # O token de reivindicação não serve como token de acesso
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 401
+
+    r = client.post(f"{settings.API_V1_STR}/auth/claim-account", json={"token": token, "password": "newpassword1"})
+    assert r.status_code == 200
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    assert client.get(f"{settings.API_V1_STR}/users/me", headers=headers).json()["email"] == GUEST_EMAIL
+
+    login_data = {"username": GUEST_EMAIL, "password": "newpassword1"}
+    assert client.post(f"{settings.API_V1_STR}/auth/access-token", data=login_data).status_code == 200
+
+    # Depois de usado, o token deixa de valer
+    r = client.post(f"{settings.API_V1_STR}/auth/claim-account", json={"token": token, "password": "other"})
+    assert r.status_code == 400
+
+    # Limpeza
+    db.expire_all()
+    _remove_guest(db)
+
+
+def test_claim_account_rejects_bad_token(client: TestClient, normal_user) -> None:
+    r = client.post(f"{settings.API_V1_STR}/auth/claim-account", json={"token": "garbage", "password": "x"})
+    assert r.status_code == 400
+
+    # Contas com senha não podem ser reivindicadas
+    token = security.create_claim_account_token(normal_user.id, normal_user.password)
+    r = client.post(f"{settings.API_V1_STR}/auth/claim-account", json={"token": token, "password": "x"})
+    assert r.status_code == 400
+
+
+def test_guest_booking_round_trips(client: TestClient, professional, db, assert_max_queries) -> None:
+    _remove_guest(db)
+    professional.services[0].id  # recarrega a fixture fora da contagem
+    # Profissional + serviço, upsert do usuário, agendamento e bitmap (5); nada após o commit
+    with assert_max_queries(8):
+        r = _book(client, professional, f"{date.today() + timedelta(days=7)}T11:00:00")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["professional_name"] == "Test Professional"
+    assert body["service_name"] == "Test Service"
+    assert body["client_name"] == "Guest Claim"
+
+    # Limpeza
+    _remove_guest(db)
+
+
+def test_guest_booking_leaves_existing_user_row_untouched(client: TestClient, professional, db) -> None:
+    from sqlalchemy import text
+
+    _remove_guest(db)
+    first = _book(client, professional, "2030-02-07T09:00:00")
+    assert first.status_code == 200
+    version = text("SELECT xmin::text FROM users WHERE email = :email")
+    before = db.execute(version, {"email": GUEST_EMAIL}).scalar_one()
+    db.commit()
+
+    second = _book(client, professional, "2030-02-07T09:30:00")
+    assert second.status_code == 200
+    assert second.json()["client_id"] == first.json()["client_id"]
+    # Sem UPDATE no-op: a linha do usuário continua na mesma versão
+    assert db.execute(version, {"email": GUEST_EMAIL}).scalar_one() == before
+    db.commit()
+
+    # Limpeza
+    _remove_guest(db)
+
+
+def test_concurrent_guest_bookings_share_one_user(client: TestClient, professional, db) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    _remove_guest(db)
+    times = [f"2030-02-08T{hour:02d}:00:00" for hour in (9, 10, 11)]
+    with ThreadPoolExecutor(max_workers=len(times)) as pool:
+        responses = list(pool.map(lambda t: _book(client, professional, t), times))
+
+    # Nenhuma falha na constraint de email único: todos viram o mesmo usuário
+    assert [r.status_code for r in responses] == [200] * len(times)
+    assert len({r.json()["client_id"] for r in responses}) == 1
+
+    # Limpeza
+    _remove_guest(db)
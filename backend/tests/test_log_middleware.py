@@ -0,0 +1,93 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.core.logging.log_context import get_trace_id
+from app.core.logging.log_settings import SamplingRule
+from app.core.logging.sampling import HttpSampler
+
+
+router = APIRouter()
+
+
+@router.get("/trace")
+async def trace():
+    return {"trace_id": get_trace_id()}
+
+
+@router.get("/missing")
+async def missing():
+    raise HTTPException(status_code=404)
+
+
+@router.get("/stream")
+async def stream():
+    return StreamingResponse(iter([b"a", b"b", b"c"]))
+
+
+@router.get("/health")
+def health():
+    return {"status": "ok"}
+
+
+def test_propagates_incoming_trace_id(make_log_client, recording_log_service):
+    client, log_service = make_log_client(router), recording_log_service
+    r = client.get("/trace", headers={"X-Trace-Id": "abc-123"})
+    assert r.headers["X-Trace-Id"] == "abc-123"
+    # O endpoint enxerga o trace_id definido pelo middleware
+    assert r.json() == {"trace_id": "abc-123"}
+    doc = log_service.documents[-1]
+    assert (doc["trace_id"], doc["level"], doc["http"]["status_code"], doc["http"]["path"]) == (
+        "abc-123", "info", 200, "/trace"
+    )
+
+
+def test_generates_trace_id_and_levels_by_status(make_log_client, recording_log_service):
+    client, log_service = make_log_client(router), recording_log_service
+    r = client.get("/missing")
+    assert r.status_code == 404
+    assert r.headers["X-Trace-Id"]
+    assert log_service.documents[-1]["level"] == "warn"
+    assert log_service.documents[-1]["trace_id"] == r.headers["X-Trace-Id"]
+
+
+def test_streaming_response_passes_through(make_log_client, recording_log_service):
+    client, log_service = make_log_client(router), recording_log_service
+    r = client.get("/stream")
+    assert r.content == b"abc"
+    assert r.headers["X-Trace-Id"]
+    assert log_service.documents[-1]["http"]["status_code"] == 200
+
+
+def test_health_is_not_logged(make_log_client, recording_log_service):
+    client, log_service = make_log_client(router), recording_log_service
+    r = client.get("/health")
+    assert r.status_code == 200
+    assert "X-Trace-Id" not in r.headers
+    assert log_service.documents == []
+
+
+def test_sampler_keeps_errors_and_slow_requests():
+    sampler = HttpSampler([SamplingRule(path="/api/v1/professionals*", rate=0.1)], 500, rand=lambda: 0.5)
+    assert sampler.decide("GET", "/api/v1/professionals/", "info", 10) == (False, None)
+    keep, decision = sampler.decide("GET", "/api/v1/professionals/1", "error", 10)
+    assert keep and (decision["rate"], decision["reason"]) == (1.0, "error")
+    keep, decision = sampler.decide("GET", "/api/v1/professionals/", "info", 800)
+    assert keep and decision["reason"] == "slow"
+    # warn não está nos níveis da regra; POST e outras rotas não casam
+    assert sampler.decide("GET", "/api/v1/professionals/", "warn", 10) == (True, None)
+    assert sampler.decide("POST", "/api/v1/professionals/", "info", 10) == (True, None)
+    assert sampler.decide("GET", "/api/v1/users/me", "info", 10) == (True, None)
+
+
+def test_sampled_documents_rebuild_request_count(make_log_client, recording_log_service):
+    import random
+
+    sampler = HttpSampler([SamplingRule(path="/trace", rate=0.2)], 10_000, rand=random.Random(3).random)
+    client, log_service = make_log_client(router, sampler), recording_log_service
+    for _ in range(500):
+        client.get("/trace")
+    assert 0 < len(log_service.documents) < 200
+    assert all(d["sampling"]["reason"] == "sampled" for d in log_service.documents)
+    # Cada documento amostrado representa 1 / rate requisições
+    estimate = sum(1 / d["sampling"]["rate"] for d in log_service.documents)
+    assert abs(estimate - 500) < 100
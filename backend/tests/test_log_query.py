@@ -0,0 +1,116 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from app.core.logging.log_query import (
+    InvalidCursor,
+    audit_trail_query,
+    decode_cursor,
+    encode_cursor,
+    errors_query,
+    page_filter,
+    stream_page,
+    trace_query,
+)
+from app.core.logging.log_repository import LOG_INDEXES
+from app.core.logging.log_settings import log_settings
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.documents:
+            yield doc
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeCollection:
+    """Devolve os documentos na ordem dada, respeitando apenas o limit."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.calls = []
+
+    def find(self, filter, **kwargs):
+        self.calls.append((filter, kwargs))
+        self.cursor = FakeCursor(self.documents[: kwargs["limit"]])
+        return self.cursor
+
+
+def make_docs(count):
+    start = datetime(2026, 1, 1)
+    return [{"_id": ObjectId(), "timestamp": start + timedelta(seconds=n), "level": "error"} for n in range(count)]
+
+
+async def read_page(collection, query, cursor=None, limit=2):
+    body = b"".join([chunk async for chunk in stream_page(collection, query, cursor, limit)])
+    return json.loads(body)
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    doc = make_docs(1)[0]
+    assert decode_cursor(encode_cursor(doc)) == (doc["timestamp"], doc["_id"])
+    with pytest.raises(InvalidCursor):
+        decode_cursor("nao-e-um-cursor")
+
+
+def test_every_query_hints_an_existing_index():
+    names = {model.document["name"] for model in LOG_INDEXES}
+    for query in (trace_query("t"), errors_query(), errors_query(category="http"), audit_trail_query("1")):
+        assert query.hint in names
+
+
+def test_page_filter_continues_after_cursor_without_skip():
+    doc = make_docs(1)[0]
+    query = errors_query(start=datetime(2025, 1, 1))
+    flt = page_filter(query, encode_cursor(doc))
+    # Mantém o início do intervalo e limita pelo cursor (ordem decrescente)
+    assert flt["timestamp"] == {"$gte": datetime(2025, 1, 1), "$lte": doc["timestamp"]}
+    assert flt["$or"] == [{"timestamp": {"$lt": doc["timestamp"]}}, {"_id": {"$lt": doc["_id"]}}]
+    assert page_filter(trace_query("t"), encode_cursor(doc))["$or"][1] == {"_id": {"$gt": doc["_id"]}}
+
+
+@pytest.mark.asyncio
+async def test_streams_page_with_next_cursor():
+    docs = make_docs(3)
+    collection = FakeCollection(docs)
+    page = await read_page(collection, errors_query(), limit=2)
+    assert [item["_id"] for item in page["items"]] == [str(d["_id"]) for d in docs[:2]]
+    assert page["next_cursor"] == encode_cursor(docs[1])
+    _, kwargs = collection.calls[-1]
+    assert kwargs["limit"] == 3 and "skip" not in kwargs
+    assert collection.cursor.closed
+
+    # Última página: sem próximo cursor
+    page = await read_page(FakeCollection(docs[2:]), errors_query(), cursor=page["next_cursor"])
+    assert len(page["items"]) == 1 and page["next_cursor"] is None
+    assert await read_page(FakeCollection([]), errors_query()) == {"items": [], "next_cursor": None}
+
+
+def test_query_api_requires_key(client, monkeypatch):
+    assert client.get("/api/v1/logs/errors").status_code == 403
+    monkeypatch.setattr(log_settings, "LOG_QUERY_API_KEY", "segredo")
+    headers = {"X-Log-Api-Key": "errado"}
+    assert client.get("/api/v1/logs/errors", headers=headers).status_code == 403
+    headers = {"X-Log-Api-Key": "segredo"}
+    r = client.get("/api/v1/logs/errors", params={"cursor": "lixo"}, headers=headers)
+    assert r.status_code == 400
+
+
+def test_pipeline_stats_requires_key(client, monkeypatch):
+    assert client.get("/api/v1/logs/stats").status_code == 403
+    monkeypatch.setattr(log_settings, "LOG_QUERY_API_KEY", "segredo")
+    assert client.get("/api/v1/logs/stats", headers={"X-Log-Api-Key": "errado"}).status_code == 403
+    r = client.get("/api/v1/logs/stats", headers={"X-Log-Api-Key": "segredo"})
+    assert r.status_code == 200
+    assert "dropped" in r.json()
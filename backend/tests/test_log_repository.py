@@ -0,0 +1,64 @@
+import pytest
+from pymongo.errors import OperationFailure
+
+from app.core.logging.log_repository import LOG_INDEXES, RETIRED_LOG_INDEXES, reconcile_log_indexes
+
+
+class FakeCollection:
+    """Guarda índices no formato de `index_information()` do pymongo."""
+
+    def __init__(self, indexes=None):
+        self.indexes = {"_id_": {"v": 2, "key": [("_id", 1)]}, **(indexes or {})}
+        self.dropped = []
+        self.created = []
+
+    async def index_information(self):
+        return dict(self.indexes)
+
+    async def drop_index(self, name):
+        if name not in self.indexes:
+            raise OperationFailure("index not found", code=27)
+        del self.indexes[name]
+        self.dropped.append(name)
+
+    async def create_indexes(self, models):
+        for model in models:
+            doc = dict(model.document)
+            doc["key"] = list(doc["key"].items())
+            self.indexes[doc.pop("name")] = {"v": 2, **doc}
+            self.created.append(model.document["name"])
+
+
+def legacy_indexes():
+    """Índices de campo único criados pelas versões anteriores."""
+    indexes = {
+        f"{field}_1": {"v": 2, "key": [(field, 1)]}
+        for field in ("trace_id", "level", "category", "action", "actor.user_id",
+                      "timestamp", "http.status_code", "environment")
+    }
+    indexes["expires_at_1"] = {"v": 2, "key": [("expires_at", 1)], "sparse": True, "expireAfterSeconds": 0}
+    return indexes
+
+
+@pytest.mark.asyncio
+async def test_migrates_legacy_single_field_indexes():
+    collection = FakeCollection({**legacy_indexes(), "manual_idx": {"v": 2, "key": [("service", 1)]}})
+    await reconcile_log_indexes(collection)
+    assert set(collection.dropped) == RETIRED_LOG_INDEXES
+    expected = {"_id_", "manual_idx"} | {m.document["name"] for m in LOG_INDEXES}
+    assert set(collection.indexes) == expected
+
+
+@pytest.mark.asyncio
+async def test_is_idempotent_and_recreates_changed_definitions():
+    collection = FakeCollection()
+    await reconcile_log_indexes(collection)
+    collection.created.clear()
+    await reconcile_log_indexes(collection)
+    assert collection.created == [] and collection.dropped == []
+
+    # Definição alterada manualmente: o índice é recriado
+    collection.indexes["level_timestamp"]["key"] = [("level", 1)]
+    await reconcile_log_indexes(collection)
+    assert collection.dropped == ["level_timestamp"]
+    assert collection.created == ["level_timestamp"]
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+import bson
+import pytest
+
+from app.core.logging.log_context import set_actor, set_trace_id
+from app.core.logging.log_schema import ActorContext, LogDocument
+from app.core.logging.log_service import LogService
+from app.core.logging.sanitizer import REDACTED
+
+
+def test_builds_bson_native_document_with_real_datetimes():
+    doc = LogService()._build_document(
+        "info", "ACTION", "msg", http={"method": "GET", "path": "/x"}, metadata={"password": "x"},
+    )
+    # Datas reais: o índice TTL em expires_at só funciona com datas BSON
+    assert isinstance(doc["timestamp"], datetime)
+    assert isinstance(doc["expires_at"], datetime) and doc["expires_at"] > doc["timestamp"]
+    assert doc["metadata"] == {"password": REDACTED}
+    assert isinstance(bson.decode(bson.encode(doc))["expires_at"], datetime)
+
+
+def test_document_keeps_the_log_document_layout():
+    doc = LogService()._build_document("audit", "ACTION", "msg", category="business")
+    assert set(doc) == set(LogDocument.model_fields)
+    assert LogDocument.model_validate(doc).level == "audit"
+    assert doc["expires_at"] is None  # audit nunca expira
+
+
+@pytest.mark.asyncio
+async def test_context_vars_and_models_become_sub_documents(recording_log_service):
+    service = recording_log_service
+    set_trace_id("trace-1")
+    set_actor(ActorContext(user_id="7", email="a@b.c"))
+    await service.error(action="FAIL", message="boom", error=ValueError("bad"))
+    doc = service.documents[-1]
+    assert doc["trace_id"] == "trace-1"
+    assert doc["actor"]["user_id"] == "7"
+    assert (doc["error"]["name"], doc["error"]["message"]) == ("ValueError", "bad")
+
+
+def test_frontend_ingress_still_validates(client):
+    r = client.post("/api/v1/logs/frontend", json={"action": "A", "message": "m", "level": "critical"})
+    assert r.status_code == 422
+    r = client.post("/api/v1/logs/frontend", json={"action": "A", "message": "m", "level": "warn"})
+    assert r.status_code == 202
@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+from app.core.logging.log_writer import LogWriter
+
+
+class RecordingSink:
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+
+    async def __call__(self, documents):
+        if self.fail:
+            raise ConnectionError("mongo down")
+        self.batches.append(list(documents))
+
+
+def make_writer(sink, batch_size=3, flush_interval_ms=60_000, max_queue_size=100, **kwargs):
+    return LogWriter(
+        batch_size=batch_size,
+        flush_interval_ms=flush_interval_ms,
+        max_queue_size=max_queue_size,
+        drain_timeout_ms=1000,
+        sink=sink,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_size_is_reached():
+    sink = RecordingSink()
+    writer = make_writer(sink)
+    writer.start()
+    for n in range(7):
+        assert writer.enqueue({"n": n})
+    await asyncio.sleep(0.05)
+    # Dois lotes cheios gravados; o restante aguarda o próximo gatilho
+    assert [len(b) for b in sink.batches][:2] == [3, 3]
+    await writer.stop()
+    assert [d["n"] for b in sink.batches for d in b] == list(range(7))
+
+
+@pytest.mark.asyncio
+async def test_flushes_partial_batch_after_interval():
+    sink = RecordingSink()
+    writer = make_writer(sink, batch_size=50, flush_interval_ms=20)
+    writer.start()
+    writer.enqueue({"n": 1})
+    await asyncio.sleep(0.1)
+    assert sink.batches == [[{"n": 1}]]
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_full_or_not_running():
+    sink = RecordingSink()
+    writer = make_writer(sink, batch_size=50, max_queue_size=2)
+    assert not writer.enqueue({"level": "info", "n": 0})
+    writer.start()
+    assert writer.enqueue({"level": "info", "n": 1}) and writer.enqueue({"level": "info", "n": 2})
+    assert not writer.enqueue({"level": "info", "n": 3})
+    await writer.stop()
+    assert sink.batches == [[{"level": "info", "n": 1}, {"level": "info", "n": 2}]]
+    assert writer.stats()["fallback"] == 1  # fora do lifespan
+    assert writer.stats()["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_enqueue_threadsafe_from_worker_thread():
+    sink = RecordingSink()
+    writer = make_writer(sink, batch_size=50, flush_interval_ms=20)
+    writer.start()
+    # Como um endpoint síncrono rodando no threadpool
+    await asyncio.to_thread(writer.enqueue_threadsafe, {"n": 1})
+    writer.enqueue_threadsafe({"n": 2})
+    await asyncio.sleep(0.1)
+    await writer.stop()
+    assert [d["n"] for b in sink.batches for d in b] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_fall_back_to_stdlib_logger(caplog):
+    writer = make_writer(RecordingSink(fail=True))
+    writer.start()
+    writer.enqueue({"level": "error", "action": "A", "message": "kept"})
+    await writer.stop()
+    assert "A: kept" in caplog.text
+    assert writer.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_overflow_sheds_low_priority_and_keeps_errors(caplog):
+    sink = RecordingSink()
+    writer = make_writer(sink, batch_size=50, max_queue_size=3)
+    writer.start()
+    for n in range(3):
+        writer.enqueue({"level": "info", "n": n})
+    # Fila cheia: warn/error/audit entram no lugar dos info mais antigos
+    assert writer.enqueue({"level": "warn", "n": 3})
+    assert writer.enqueue({"level": "error", "n": 4})
+    assert writer.enqueue({"level": "audit", "n": 5})
+    # Sem info para descartar: warn é descartado, error vai para o logger padrão
+    assert not writer.enqueue({"level": "warn", "n": 6})
+    assert not writer.enqueue({"level": "error", "action": "A", "message": "kept"})
+    await writer.stop()
+
+    assert [d["n"] for d in sink.batches[0]] == [3, 4, 5]
+    assert "A: kept" in caplog.text
+    stats = writer.stats()
+    assert (stats["queued"], stats["written"], stats["dropped"], stats["fallback"]) == (6, 3, 4, 1)
+
+
+@pytest.mark.asyncio
+async def test_fallback_policy_never_drops(caplog):
+    writer = make_writer(RecordingSink(), batch_size=50, max_queue_size=1, overflow_policy="fallback")
+    writer.start()
+    writer.enqueue({"level": "info", "n": 0})
+    writer.enqueue({"level": "debug", "action": "B", "message": "overflow"})
+    await writer.stop()
+    assert writer.stats()["dropped"] == 0
+    assert "B: overflow" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_slow_sink_keeps_memory_bounded():
+    async def stalled(documents):
+        await asyncio.sleep(3600)
+
+    writer = make_writer(stalled, batch_size=10, max_queue_size=100)
+    writer.drain_timeout = 0.05
+    writer.start()
+    for n in range(10_000):
+        writer.enqueue({"level": "info", "n": n})
+        if n % 500 == 0:
+            await asyncio.sleep(0)
+    assert writer.queue_size <= 100
+    await writer.stop()
+    stats = writer.stats()
+    # Todo documento termina gravado, descartado ou contado como falha
+    assert stats["written"] + stats["dropped"] + stats["failed"] == 10_000
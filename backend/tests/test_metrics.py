@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+from prometheus_client.parser import text_string_to_metric_families
+
+
+def sample(body: str, name: str, **labels) -> float:
+    for family in text_string_to_metric_families(body):
+        for s in family.samples:
+            if s.name == name and all(s.labels.get(k) == v for k, v in labels.items()):
+                return s.value
+    return 0.0
+
+
+def test_metrics_use_route_template_and_status_class(client, professional):
+    before = client.get("/metrics").text
+    route = "/api/v1/professionals/{professional_id}"
+    client.get(f"/api/v1/professionals/{professional.id}")
+    client.get("/nao-existe-123")
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+
+    labels = {"method": "GET", "route": route, "status": "2xx"}
+    assert sample(r.text, "http_requests_total", **labels) == sample(before, "http_requests_total", **labels) + 1
+    assert sample(r.text, "http_request_duration_seconds_count", **labels) >= 1
+    # Caminho sem rota não gera uma série por URL
+    assert sample(r.text, "http_requests_total", method="GET", route="unmatched", status="4xx") >= 1
+    assert "nao-existe-123" not in r.text
+    assert 'route="/metrics"' not in r.text
+
+
+def test_multiprocess_metrics_are_summed_across_workers(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    record = "from app.core.metrics import observe_request; observe_request('GET', '/x', 200, 0.01)"
+    # Dois "workers" independentes gravam no mesmo diretório
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", record], env=env, check=True)
+    body = subprocess.run(
+        [sys.executable, "-c", "from app.core.metrics import render_metrics; print(render_metrics()[0].decode())"],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    assert sample(body, "http_requests_total", method="GET", route="/x", status="2xx") == 2
+    assert sample(body, "http_request_duration_seconds_count", route="/x") == 2
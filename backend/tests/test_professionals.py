@@ -0,0 +1,41 @@
+from fastapi.testclient import TestClient
+from app.core.config import settings
+
+
+def test_list_professionals_includes_user_and_services(
+    client: TestClient, professional, assert_max_queries
+) -> None:
+    # Profissionais + serviços em lote, independente do número de linhas
+    with assert_max_queries(2):
+        r = client.get(f"{settings.API_V1_STR}/professionals/", params={"especialidade": "Test Speciality"})
+    assert r.status_code == 200
+    found = next(p for p in r.json() if p["id"] == professional.id)
+    assert found["user"]["name"] == "Test Professional"
+    assert found["user"]["professional"]["id"] == professional.id
+    assert [s["name"] for s in found["services"]] == ["Test Service"]
+
+
+def test_read_professional_by_id(client: TestClient, professional, assert_max_queries) -> None:
+    with assert_max_queries(3):
+        r = client.get(f"{settings.API_V1_STR}/professionals/{professional.id}")
+    assert r.status_code == 200
+    assert r.json()["user"]["professional"]["speciality"] == "Test Speciality"
+
+    r = client.get(f"{settings.API_V1_STR}/professionals/999999")
+    assert r.status_code == 404
+
+
+def test_list_services_by_professional(client: TestClient, professional, assert_max_queries) -> None:
+    with assert_max_queries(1):
+        r = client.get(f"{settings.API_V1_STR}/services/", params={"professional_id": professional.id})
+    assert r.status_code == 200
+    assert [s["duration"] for s in r.json()] == [30]
+
+
+def test_directory_lists_without_services(client: TestClient, professional, assert_max_queries) -> None:
+    with assert_max_queries(1):
+        r = client.get(f"{settings.API_V1_STR}/professionals/directory", params={"especialidade": "Test Speciality"})
+    assert r.status_code == 200
+    found = next(p for p in r.json() if p["id"] == professional.id)
+    assert found["name"] == "Test Professional"
+    assert "services" not in found and "user" not in found
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+from fastapi import APIRouter
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, SessionLocal, async_engine
+from app.core.logging import log_dependency
+from app.core.logging.log_settings import log_settings
+
+
+router = APIRouter()
+
+
+# Endpoint síncrono: roda no threadpool
+@router.get("/sync")
+def sync_endpoint():
+    with SessionLocal() as db:
+        db.execute(text("SELECT 1"))
+        db.execute(text("SELECT 2"))
+    return {}
+
+
+@router.get("/async")
+async def async_endpoint():
+    async with AsyncSessionLocal() as db:
+        for n in range(3):
+            await db.execute(text(f"SELECT {n}"))
+    return {}
+
+
+def test_access_log_carries_statement_count_and_db_time(make_log_client, recording_log_service):
+    client, log_service = make_log_client(router), recording_log_service
+    client.get("/sync")
+    http = log_service.documents[-1]["http"]
+    assert http["db_query_count"] == 2
+    assert http["db_time_ms"] > 0
+    client.get("/async")
+    assert log_service.documents[-1]["http"]["db_query_count"] == 3
+    # A conexão assíncrona ficou presa ao event loop deste cliente; descarta sem fechar
+    asyncio.run(async_engine.dispose(close=False))
+
+
+def test_slow_statements_are_logged(monkeypatch, recording_log_service):
+    recorder = recording_log_service
+    monkeypatch.setattr(log_dependency, "_log_service", recorder)
+    monkeypatch.setattr(log_settings, "LOG_SLOW_QUERY_MS", 20)
+    with SessionLocal() as db:
+        db.execute(text("SELECT pg_sleep(0.03)"))
+        db.execute(text("SELECT 1"))
+    slow = [d for d in recorder.documents if d["action"] == "SLOW_QUERY"]
+    assert len(slow) == 1
+    assert slow[0]["level"] == "warn"
+    assert "pg_sleep" in slow[0]["metadata"]["statement"]
+
+
+def test_assert_max_queries_catches_n_plus_one(client, professional, assert_max_queries):
+    with assert_max_queries(1) as stats:
+        with SessionLocal() as db:
+            db.execute(text("SELECT 1"))
+    assert stats.count == 1
+
+    with pytest.raises(AssertionError, match="3 SQL statements"):
+        with assert_max_queries(2):
+            client.get(f"{settings.API_V1_STR}/professionals/{professional.id}")
@@ -0,0 +1,102 @@
+import tracemalloc
+
+from app.core.logging.log_settings import log_settings
+from app.core.logging.sanitizer import MAX_DEPTH_MARKER, REDACTED, TRUNCATED_ITEMS_KEY, sanitize
+
+
+def legacy_sanitize(data, _sensitive=None):
+    """Implementação anterior: recria o conjunto a cada chamada e copia tudo, sempre."""
+    if _sensitive is None:
+        _sensitive = set(f.strip().lower() for f in log_settings.LOG_SENSITIVE_FIELDS.split(",") if f.strip())
+    if isinstance(data, dict):
+        return {k: REDACTED if k.lower() in _sensitive else legacy_sanitize(v, _sensitive) for k, v in data.items()}
+    if isinstance(data, list):
+        return [legacy_sanitize(item, _sensitive) for item in data]
+    if isinstance(data, str) and len(data) > log_settings.LOG_MAX_FIELD_LENGTH:
+        return data[: log_settings.LOG_MAX_FIELD_LENGTH] + "...[TRUNCATED]"
+    return data
+
+
+def clean_payload(events: int = 20):
+    return {
+        "page": "/agenda",
+        "filters": {"especialidade": "Dentista", "dias": [1, 2, 3]},
+        "events": [{"type": "click", "target": f"button-{n}", "ts": n} for n in range(events)],
+    }
+
+
+def test_redacts_sensitive_keys_case_insensitively():
+    data = {"user": {"Password": "x", "email": "a@b.c"}, "items": [{"TOKEN": "t"}]}
+    result = sanitize(data)
+    assert result == {"user": {"Password": REDACTED, "email": "a@b.c"}, "items": [{"TOKEN": REDACTED}]}
+    assert data["user"]["Password"] == "x"  # entrada não é alterada
+
+
+def test_returns_input_uncopied_when_clean():
+    data = clean_payload()
+    assert sanitize(data) is data
+
+
+def test_copies_only_the_changed_branch():
+    data = clean_payload()
+    data["auth"] = {"authorization": "Bearer abc"}
+    result = sanitize(data)
+    assert result is not data
+    assert result["auth"] == {"authorization": REDACTED}
+    assert result["filters"] is data["filters"]
+    assert result["events"] is data["events"]
+
+
+def test_truncates_long_strings():
+    long = "x" * (log_settings.LOG_MAX_FIELD_LENGTH + 10)
+    assert sanitize({"note": long})["note"].endswith("...[TRUNCATED]")
+
+
+def test_caps_depth():
+    data = current = {}
+    for _ in range(50):
+        current["child"] = {}
+        current = current["child"]
+    result = sanitize(data)
+    for _ in range(log_settings.LOG_SANITIZE_MAX_DEPTH - 1):
+        result = result["child"]
+    assert result["child"] == MAX_DEPTH_MARKER
+
+
+def test_caps_total_elements():
+    data = {"rows": list(range(100_000)), "tail": "kept?"}
+    result = sanitize(data)
+    rows = result["rows"]
+    assert len(rows) == log_settings.LOG_SANITIZE_MAX_ITEMS
+    assert rows[-1].startswith("...[")
+    assert TRUNCATED_ITEMS_KEY in result
+
+
+def test_clean_payload_allocates_far_less_than_copying_sanitizer():
+    payload = clean_payload(events=200)
+    tracemalloc.start()
+    sanitize(payload)
+    current_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.reset_peak()
+    legacy_sanitize(payload)
+    legacy_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert current_bytes * 10 < legacy_bytes
+
+
+def test_huge_payload_visits_at_most_max_items():
+    entered = 0
+
+    class Row(dict):
+        def items(self):
+            nonlocal entered
+            entered += 1
+            return super().items()
+
+    huge = {"rows": [Row(a=n, b=[n] * 10) for n in range(200_000)]}
+    result = sanitize(huge)
+
+    # Cada linha visitada consome orçamento: o resto do payload nem é lido
+    assert 0 < entered <= log_settings.LOG_SANITIZE_MAX_ITEMS
+    assert result["rows"][-1].startswith("...[")
@@ -0,0 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, select, text
+
+from app.core.database import engine
+from app.main import STARTUP_LOCK_KEY, initialize_database
+from app.models.user import User
+
+
+def test_workers_starting_together_populate_once(db):
+    # Três "workers" sobem ao mesmo tempo
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        for future in [pool.submit(initialize_database) for _ in range(3)]:
+            future.result()
+
+    assert db.scalar(select(func.count()).where(User.email == "roberto.silva@example.com")) == 1
+    # O lock foi liberado por todos
+    with engine.connect() as connection:
+        assert connection.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": STARTUP_LOCK_KEY})
+        connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": STARTUP_LOCK_KEY})
@@ -67,3 +67,50 @@ def test_delete_other_user_forbidden(client: TestClient, normal_user, db) -> Non
 
     # Limpeza
     crud_user.remove(db, id=other_user.id)
+
+
+def _auth_headers(client: TestClient, email: str) -> dict:
+    login_data = {"username": email, "password": "password123"}
+    token = client.post(f"{settings.API_V1_STR}/auth/access-token", data=login_data).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_current_user_served_from_cache(client: TestClient, professional, assert_max_queries) -> None:
+    headers = _auth_headers(client, "test_professional@example.com")
+    client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+
+    # Usuário e perfil profissional vêm do cache: nenhuma consulta
+    with assert_max_queries(0):
+        r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 200
+    assert r.json()["professional"]["id"] == professional.id
+
+    # A variante assíncrona também usa o cache: só a consulta de agendamentos
+    with assert_max_queries(1):
+        r = client.get(f"{settings.API_V1_STR}/appointments/my-appointments", headers=headers)
+    assert r.status_code == 200
+
+
+def test_update_and_deactivation_invalidate_cached_user(client: TestClient, db) -> None:
+    email = "cached_user@example.com"
+    user = crud_user.get_by_email(db, email=email)
+    if user:
+        crud_user.remove(db, id=user.id)
+    user = crud_user.create(db, obj_in=UserCreate(
+        email=email, password="password123", name="Cached", type=UserType.CLIENT, active=True
+    ))
+    headers = _auth_headers(client, email)
+    assert client.get(f"{settings.API_V1_STR}/users/me", headers=headers).json()["name"] == "Cached"
+
+    r = client.put(f"{settings.API_V1_STR}/users/{user.id}", json={"name": "Renamed"}, headers=headers)
+    assert r.status_code == 200
+    assert client.get(f"{settings.API_V1_STR}/users/me", headers=headers).json()["name"] == "Renamed"
+
+    # Desativação fora da API também passa pelo CRUD e invalida o cache
+    crud_user.update(db, db_obj=user, obj_in={"active": False})
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 400
+
+    crud_user.remove(db, id=user.id)
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 404
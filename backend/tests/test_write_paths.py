@@ -0,0 +1,101 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.models.appointment import Appointment
+from app.models.service import Service
+from app.models.user import User
+from app.services import availability_bitmap
+
+API = settings.API_V1_STR
+# Dentro do horizonte dos bitmaps, para que a escrita também os atualize
+DAY = date.today() + timedelta(days=7)
+
+
+@pytest.fixture(scope="module")
+def headers(client: TestClient, professional) -> dict:
+    login_data = {"username": "test_professional@example.com", "password": "password123"}
+    token = client.post(f"{API}/auth/access-token", data=login_data).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    # Usuário autenticado fica em cache: as contagens abaixo são só da escrita
+    client.get(f"{API}/users/me", headers=headers)
+    return headers
+
+
+def test_create_appointment_statements(client: TestClient, professional, headers, db, assert_max_queries) -> None:
+    service_id = professional.services[0].id
+    # Profissional + serviço, INSERT ... RETURNING e bitmap (5); nenhum reload após o commit
+    with assert_max_queries(7):
+        r = client.post(f"{API}/appointments/", json={
+            "professional_id": professional.id,
+            "service_id": service_id,
+            "date_time": f"{DAY}T09:00:00",
+            "duration": 30,
+        }, headers=headers)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["professional_name"] == "Test Professional"
+    assert body["client_name"] == "Test Professional"
+    assert body["service_name"] == "Test Service"
+
+    # Limpeza
+    db.query(Appointment).filter(Appointment.id == body["id"]).delete()
+    availability_bitmap.refresh_days(db, professional.id, [DAY])
+    db.commit()
+
+
+def test_create_service_statements(client: TestClient, professional, headers, db, assert_max_queries) -> None:
+    with assert_max_queries(1):
+        r = client.post(f"{API}/services/", json={
+            "professional_id": professional.id, "name": "Write Path Service", "duration": 45, "price": 50,
+        }, headers=headers)
+    assert r.status_code == 200
+    assert r.json()["id"] and r.json()["created_at"]
+
+    # Limpeza
+    db.query(Service).filter(Service.id == r.json()["id"]).delete()
+    db.commit()
+
+
+def test_create_block_statements(client: TestClient, professional, headers, db, assert_max_queries) -> None:
+    # INSERT ... RETURNING e bitmap (5)
+    with assert_max_queries(6):
+        r = client.post(f"{API}/blocks/", json={
+            "professional_id": professional.id,
+            "start_time": f"{DAY}T09:00:00",
+            "end_time": f"{DAY}T10:00:00",
+        }, headers=headers)
+    assert r.status_code == 200
+
+    # Limpeza
+    client.delete(f"{API}/blocks/{r.json()['id']}", headers=headers)
+
+
+def test_working_hours_batch_statements(client: TestClient, professional, headers, assert_max_queries) -> None:
+    hours = [
+        {"professional_id": professional.id, "day_of_week": day, "start_time": "09:00", "end_time": "12:00"}
+        for day in range(5)
+    ]
+    # DELETE e um único INSERT de várias linhas, sem refresh por linha
+    with assert_max_queries(2):
+        r = client.post(f"{API}/working-hours/batch", json=hours, headers=headers)
+    assert r.status_code == 200
+    assert len({wh["id"] for wh in r.json()}) == 5
+
+
+def test_create_user_statements(client: TestClient, db, assert_max_queries) -> None:
+    email = "write_path_user@example.com"
+    db.query(User).filter(User.email == email).delete()
+    db.commit()
+    # Verificação do email e INSERT
+    with assert_max_queries(2):
+        r = client.post(f"{API}/users/", json={
+            "email": email, "password": "password123", "name": "Write Path", "type": "client",
+        })
+    assert r.status_code == 201
+    assert r.json()["professional"] is None
+
+    # Limpeza
+    db.query(User).filter(User.email == email).delete()
+    db.commit()